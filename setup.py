@@ -33,5 +33,8 @@ setup(
         'docopt >= 0.6.2',
         'pyvmomi >= 6.0.0',
         'vconnector >= 0.5.0',
-    ]
+    ],
+    extras_require={
+        'orjson': ['orjson'],
+    }
 )
@@ -0,0 +1,147 @@
+# Copyright (c) 2013-2015 Marin Atanasov Nikolov <dnaeon@gmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer
+#    in this position and unchanged.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR(S) ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR(S) BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+vPoller Cache module
+
+"""
+
+import time
+import heapq
+import itertools
+import threading
+
+__all__ = ['TTLCache']
+
+
+class TTLCache(object):
+    """
+    TTLCache class
+
+    A simple cache, which expires entries after a period of time
+
+    Entries are also kept in a heap ordered by expiration time, so
+    that expired entries and the entry closest to expiration are
+    found without scanning the whole cache. Heap items of entries
+    which have been replaced or removed are skipped when popped.
+
+    """
+    def __init__(self, ttl, maxsize=0):
+        """
+        Initializes a new TTLCache object
+
+        Args:
+            ttl     (int): Time in seconds after which an entry
+                           is considered as expired
+            maxsize (int): Upperbound limit on the number of entries
+                           stored in the cache, zero means no limit
+
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """
+        Get an entry from the cache
+
+        Args:
+            key: The key of the entry
+
+        Returns:
+            The cached value or None if the entry is missing or expired
+
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            expires, value = item
+            if expires < time.time():
+                del self._data[key]
+                return None
+
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Add an entry to the cache
+
+        The expired entries are removed first, so that entries which
+        are never requested again do not stay in the cache. If the
+        cache is still full, the entry which is closest to expiration
+        is evicted.
+
+        Args:
+            key:         The key of the entry
+            value:       The value to be cached
+            ttl   (int): Time in seconds for which this entry is cached,
+                         if not specified the default TTL is used
+
+        """
+        if ttl is None:
+            ttl = self.ttl
+
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._expire()
+            if self.maxsize > 0 and key not in self._data:
+                while len(self._data) >= self.maxsize:
+                    self._pop()
+
+            expires = time.time() + ttl
+            self._data[key] = (expires, value)
+            # The counter keeps keys from being compared on equal expiration
+            heapq.heappush(self._heap, (expires, next(self._counter), key))
+
+    def clear(self):
+        """
+        Remove all entries from the cache
+
+        """
+        with self._lock:
+            self._data.clear()
+            self._heap = []
+
+    def _expire(self):
+        now = time.time()
+        while self._heap and self._heap[0][0] < now:
+            self._pop()
+
+    def _pop(self):
+        # Removes the entry closest to expiration, unless its
+        # heap item is stale
+        expires, _, key = heapq.heappop(self._heap)
+        item = self._data.get(key)
+        if item is not None and item[0] == expires:
+            del self._data[key]
@@ -31,6 +31,7 @@ import json
 
 import zmq
 
+from vpoller import codec
 from vpoller.log import logger
 
 __all__ = ['VPollerClient', 'validate_message']
@@ -53,6 +54,10 @@ class VPollerClient(object):
         """
         Initializes a VPollerClient object
 
+        The ZeroMQ context and socket of the client are created on
+        the first request and reused by subsequent requests, until
+        the client is closed.
+
         Args:
             timeout  (int): Timeout after that number of milliseconds
             retries  (int): Number of retries
@@ -62,6 +67,68 @@ class VPollerClient(object):
         self.timeout = timeout
         self.retries = retries
         self.endpoint = endpoint
+        self.zcontext = None
+        self.zclient = None
+        self.zpoller = None
+        self.relaxed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def connect(self):
+        """
+        Connects the client socket to the endpoint
+
+        """
+        logger.debug('Connecting to endpoint: %s', self.endpoint)
+
+        if self.zcontext is None:
+            self.zcontext = zmq.Context()
+            self.zpoller = zmq.Poller()
+
+        self.zclient = self.zcontext.socket(zmq.REQ)
+        self.zclient.setsockopt(zmq.LINGER, 0)
+
+        # Allow a request to be resent on the same socket without
+        # waiting for the reply of the previous one. Replies to
+        # previous requests are then discarded by the socket.
+        try:
+            self.zclient.setsockopt(zmq.REQ_RELAXED, 1)
+            self.zclient.setsockopt(zmq.REQ_CORRELATE, 1)
+            self.relaxed = True
+        except (AttributeError, zmq.ZMQError):
+            self.relaxed = False
+
+        self.zclient.connect(self.endpoint)
+        self.zpoller.register(self.zclient, zmq.POLLIN)
+
+    def disconnect(self):
+        """
+        Closes the client socket
+
+        """
+        if self.zclient is None:
+            return
+
+        self.zpoller.unregister(self.zclient)
+        self.zclient.close()
+        self.zclient = None
+
+    def close(self):
+        """
+        Closes the client socket and terminates the ZeroMQ context
+
+        """
+        logger.debug('Closing sockets and exiting')
+
+        self.disconnect()
+        if self.zcontext is not None:
+            self.zcontext.term()
+            self.zcontext = None
+            self.zpoller = None
 
     def run(self, msg):
         """
@@ -71,6 +138,10 @@ class VPollerClient(object):
 
         http://zguide.zeromq.org/py:all#Client-Side-Reliability-Lazy-Pirate-Pattern
 
+        If supported by libzmq, requests are resent on the same socket
+        and replies are matched to the last request sent, so that a
+        retry does not require a new connection.
+
         Args:
             msg (dict): The client message to send
 
@@ -80,54 +151,38 @@ class VPollerClient(object):
         logger.debug('Number of retries: %d', self.retries)
         logger.debug('Message to be sent: %s', msg)
 
-        self.zcontext = zmq.Context()
-        self.zclient = self.zcontext.socket(zmq.REQ)
-        self.zclient.connect(self.endpoint)
-        self.zclient.setsockopt(zmq.LINGER, 0)
-        self.zpoller = zmq.Poller()
-        self.zpoller.register(self.zclient, zmq.POLLIN)
         result = None
+        retries = self.retries
+
+        while retries > 0:
+            if self.zclient is None:
+                self.connect()
 
-        while self.retries > 0:
             logger.debug('Sending client message...')
 
             # Send our message out
-            self.zclient.send_json(msg)
+            self.zclient.send(codec.dumps(msg))
             socks = dict(self.zpoller.poll(self.timeout))
 
             # Do we have a reply?
             if socks.get(self.zclient) == zmq.POLLIN:
                 logger.debug('Received response on client socket')
-                result = self.zclient.recv_unicode()
+                result = self.zclient.recv_string()
                 logger.debug('Received message was: %s', result)
                 break
             else:
                 # We didn't get a reply back from the server, let's retry
-                self.retries -= 1
+                retries -= 1
                 logger.warning(
                     'Did not receive response, retrying...'
                 )
 
-                # Socket is confused. Close and remove it.
-                logger.debug('Closing sockets and re-establishing connection...')
-                self.zclient.close()
-                self.zpoller.unregister(self.zclient)
-
-                # Re-establish the connection
-                logger.debug(
-                    'Re-establishing connection to endpoint: %s',
-                    self.endpoint
-                )
-                self.zclient = self.zcontext.socket(zmq.REQ)
-                self.zclient.connect(self.endpoint)
-                self.zclient.setsockopt(zmq.LINGER, 0)
-                self.zpoller.register(self.zclient, zmq.POLLIN)
-
-        # Close the socket and terminate the context
-        logger.debug('Closing sockets and exiting')
-        self.zclient.close()
-        self.zpoller.unregister(self.zclient)
-        self.zcontext.term()
+                # Without relaxed mode the socket is confused. Close and
+                # remove it, a new connection is established before the
+                # next request.
+                if not self.relaxed:
+                    logger.debug('Closing socket and re-establishing connection...')
+                    self.disconnect()
 
         # Did we have any result reply at all?
         if result is None:
@@ -154,16 +209,13 @@ def validate_message(msg, required):
     if not required:
         return True
 
-    logger.debug(
-        'Validating client message, required to have: %s',
-        required
-    )
-
     # Check if we have the required message attributes
-    if not all(k in msg for k in required):
-        logger.debug('Required message keys are missing')
+    missing = frozenset(required).difference(msg)
+    if missing:
+        logger.debug(
+            'Required message keys are missing: %s',
+            ', '.join(sorted(missing))
+        )
         return False
 
-    logger.debug('Client message successfully validated')
-
     return True
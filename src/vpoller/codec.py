@@ -0,0 +1,131 @@
+# Copyright (c) 2013-2015 Marin Atanasov Nikolov <dnaeon@gmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer
+#    in this position and unchanged.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR(S) ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR(S) BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+vPoller Codec module
+
+Provides routines for serializing and deserializing vPoller messages.
+
+The orjson module is used if it is available, otherwise
+the json module from the standard library is used.
+
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = ['DefaultJSONEncoder', 'dumps', 'loads']
+
+
+class DefaultJSONEncoder(json.JSONEncoder):
+    """
+    DefaultJSONEncoder is a custom JSONEncoder class that knows how to
+    encode core custom objects.
+
+    Until pyVmomi supports encoding of core objects to JSON we cannot
+    marshal arbitrary objects on the fly, thus the need for this class.
+
+    See https://github.com/vmware/pyvmomi/issues/21 for more info.
+    """
+    def default(self, obj):
+        try:
+            return super(DefaultJSONEncoder, self).default(obj)
+        except Exception:
+            return obj.__dict__
+
+# Encoder used when orjson is not available. Created once and
+# reused, with compact separators so that no extra whitespace is
+# sent over the wire.
+_encoder = DefaultJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+def _default(obj):
+    """
+    Serializes objects which orjson does not know about
+
+    orjson does not serialize subclasses of float, such as the
+    pyVmomi 'double' type, so scalar values are converted to their
+    builtin type, as the json module does.
+
+    """
+    if isinstance(obj, float):
+        return float(obj)
+
+    if isinstance(obj, int):
+        return int(obj)
+
+    if isinstance(obj, str):
+        return str(obj)
+
+    try:
+        return obj.__dict__
+    except AttributeError:
+        raise TypeError(
+            'Object of type {} is not JSON serializable'.format(type(obj).__name__)
+        )
+
+def dumps(obj):
+    """
+    Serializes an object to JSON
+
+    Args:
+        obj: The object to serialize
+
+    Returns:
+        The UTF-8 encoded JSON document as bytes
+
+    Raises:
+        TypeError, ValueError
+
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    return _encoder.encode(obj).encode('utf-8')
+
+def loads(data):
+    """
+    Deserializes a JSON document
+
+    Args:
+        data (bytes or str): The JSON document to deserialize
+
+    Returns:
+        The deserialized object
+
+    Raises:
+        ValueError
+
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+
+    return json.loads(data)
@@ -29,7 +29,7 @@ This module is to be used by vPoller C clients only.
 
 """
 
-import json
+from vpoller import codec
 
 
 class HelperAgent(object):
@@ -56,7 +56,10 @@ class HelperAgent(object):
         NULL-terminates the data, so that C clients can
         properly get the data we send to them.
 
+        Returns:
+            The UTF-8 encoded JSON document as bytes
+
         """
-        result = json.dumps(self.data)
+        result = codec.dumps(self.data)
 
-        return result + '\0'
+        return result + b'\0'
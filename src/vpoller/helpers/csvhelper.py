@@ -32,7 +32,11 @@ translating a result vPoller message to CSV format.
 
 import csv
 import json
-import cStringIO
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
 
 
 class HelperAgent(object):
@@ -64,7 +68,7 @@ class HelperAgent(object):
             return json.dumps(self.data, indent=4)
 
         data = self.data['result']
-        result = cStringIO.StringIO()
+        result = StringIO()
         headers = sorted(data[0].keys())
 
         writer = csv.DictWriter(
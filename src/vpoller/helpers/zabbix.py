@@ -30,15 +30,67 @@ translating a result vPoller message to a Zabbix-friendly format.
 
 """
 
-import json
 import logging
 
+from vpoller import codec
+
 
 class HelperAgent(object):
     """
     HelperAgent class of the Zabbix vPoller Helper
 
     """
+    # Methods that the Helper knows about and how to process
+    methods = {
+        'about': 'zabbix_item_value',
+        'event.latest': 'zabbix_item_value',
+        'session.get': 'zabbix_lld_data',
+        'datacenter.discover': 'zabbix_lld_data',
+        'datacenter.get': 'zabbix_item_value',
+        'datacenter.alarm.get': 'zabbix_lld_data',
+        'datacenter.perf.metric.get': 'zabbix_item_value',
+        'datacenter.perf.metric.info': 'zabbix_lld_data',
+        'cluster.alarm.get': 'zabbix_lld_data',
+        'cluster.discover': 'zabbix_lld_data',
+        'cluster.get': 'zabbix_item_value',
+        'cluster.perf.metric.get': 'zabbix_item_value',
+        'cluster.perf.metric.info': 'zabbix_lld_data',
+        'host.alarm.get': 'zabbix_lld_data',
+        'host.discover': 'zabbix_lld_data',
+        'host.get': 'zabbix_item_value',
+        'host.batch.get': 'zabbix_lld_data',
+        'host.vm.get': 'zabbix_lld_data',
+        'host.datastore.get': 'zabbix_lld_data',
+        'host.cluster.get': 'zabbix_item_value',
+        'host.perf.metric.get': 'zabbix_item_value',
+        'host.perf.metric.info': 'zabbix_lld_data',
+        'vm.alarm.get': 'zabbix_lld_data',
+        'vm.discover': 'zabbix_lld_data',
+        'vm.get': 'zabbix_item_value',
+        'vm.batch.get': 'zabbix_lld_data',
+        'vm.datastore.get': 'zabbix_lld_data',
+        'vm.disk.discover': 'zabbix_vm_disk_discover',
+        'vm.disk.get': 'zabbix_vm_disk_get',
+        'vm.host.get': 'zabbix_item_value',
+        'vm.process.get': 'zabbix_vm_process_get',
+        'vm.cpu.usage.percent': 'zabbix_item_value',
+        'vm.perf.metric.get': 'zabbix_item_value',
+        'vm.perf.metric.info': 'zabbix_lld_data',
+        'vm.snapshot.get': 'zabbix_lld_data',
+        'datastore.alarm.get': 'zabbix_lld_data',
+        'datastore.discover': 'zabbix_lld_data',
+        'datastore.get': 'zabbix_item_value',
+        'datastore.batch.get': 'zabbix_lld_data',
+        'datastore.host.get': 'zabbix_lld_data',
+        'datastore.vm.get': 'zabbix_lld_data',
+        'datastore.perf.metric.get': 'zabbix_item_value',
+        'datastore.perf.metric.info': 'zabbix_lld_data',
+        'vsan.health.get': 'zabbix_item_value',
+        'vm.guest.net.get': 'zabbix_vm_guest_net_discover',
+        'resource.pool.get': 'zabbix_item_value',
+        'resource.pool.vm.get': 'zabbix_lld_data',
+    }
+
     def __init__(self, msg, data):
         """
         Initializes a new HelperAgent object
@@ -51,54 +103,6 @@ class HelperAgent(object):
         self.msg = msg
         self.data = data
 
-        # Methods that the Helper knows about and how to process
-        self.methods = {
-            'about': self.zabbix_item_value,
-            'event.latest': self.zabbix_item_value,
-            'session.get': self.zabbix_lld_data,
-            'datacenter.discover': self.zabbix_lld_data,
-            'datacenter.get': self.zabbix_item_value,
-            'datacenter.alarm.get': self.zabbix_lld_data,
-            'datacenter.perf.metric.get': self.zabbix_item_value,
-            'datacenter.perf.metric.info': self.zabbix_lld_data,
-            'cluster.alarm.get': self.zabbix_lld_data,
-            'cluster.discover': self.zabbix_lld_data,
-            'cluster.get': self.zabbix_item_value,
-            'cluster.perf.metric.get': self.zabbix_item_value,
-            'cluster.perf.metric.info': self.zabbix_lld_data,
-            'host.alarm.get': self.zabbix_lld_data,
-            'host.discover': self.zabbix_lld_data,
-            'host.get': self.zabbix_item_value,
-            'host.vm.get': self.zabbix_lld_data,
-            'host.datastore.get': self.zabbix_lld_data,
-            'host.cluster.get': self.zabbix_item_value,
-            'host.perf.metric.get': self.zabbix_item_value,
-            'host.perf.metric.info': self.zabbix_lld_data,
-            'vm.alarm.get': self.zabbix_lld_data,
-            'vm.discover': self.zabbix_lld_data,
-            'vm.get': self.zabbix_item_value,
-            'vm.datastore.get': self.zabbix_lld_data,
-            'vm.disk.discover': self.zabbix_vm_disk_discover,
-            'vm.disk.get': self.zabbix_vm_disk_get,
-            'vm.host.get': self.zabbix_item_value,
-            'vm.process.get': self.zabbix_vm_process_get,
-            'vm.cpu.usage.percent': self.zabbix_item_value,
-            'vm.perf.metric.get': self.zabbix_item_value,
-            'vm.perf.metric.info': self.zabbix_lld_data,
-            'vm.snapshot.get': self.zabbix_lld_data,
-            'datastore.alarm.get': self.zabbix_lld_data,
-            'datastore.discover': self.zabbix_lld_data,
-            'datastore.get': self.zabbix_item_value,
-            'datastore.host.get': self.zabbix_lld_data,
-            'datastore.vm.get': self.zabbix_lld_data,
-            'datastore.perf.metric.get': self.zabbix_item_value,
-            'datastore.perf.metric.info': self.zabbix_lld_data,
-            'vsan.health.get': self.zabbix_item_value,
-            'vm.guest.net.get': self.zabbix_vm_guest_net_discover,
-            'resource.pool.get': self.zabbix_item_value,
-            'resource.pool.vm.get': self.zabbix_lld_data,
-        }
-
     def run(self):
         """
         Main Helper method
@@ -130,7 +134,10 @@ class HelperAgent(object):
         # The original method requested by the client
         self.method = self.msg['method']
 
-        if self.method not in self.methods:
+        # Resolve the method used for processing the data only once
+        handler = self.methods.get(self.method)
+
+        if handler is None:
             logging.warning(
                 '[zbx-helper]: Do not know how to process %s method',
                 self.method
@@ -139,17 +146,17 @@ class HelperAgent(object):
 
         logging.debug(
             '[zbx-helper]: Processing data using %s() method',
-            self.methods[self.method].__name__
+            handler
         )
-        
-        result = self.methods[self.method]()
+
+        result = getattr(self, handler)()
 
         logging.debug(
             '[zbx-helper]: Returning result after data processing: %s',
             result
         )
 
-        return json.dumps(result, ensure_ascii=False)
+        return codec.dumps(result).decode('utf-8')
 
     def zabbix_item_value(self):
         """
@@ -203,13 +210,7 @@ class HelperAgent(object):
         obj_t = self.method.split('.')[0].upper()
         result = self.data['result'][0]['disk']
 
-        data = []
-
-        for item in result:
-            props = [('{#VSPHERE.' + obj_t + '.' + k.upper() + '}', v) for k, v in item.items()]
-            data.append(dict(props))
-
-        return {'data': data}
+        return {'data': self._lld_items(obj_t, result)}
 
     def zabbix_vm_guest_net_discover(self):
         """
@@ -231,13 +232,7 @@ class HelperAgent(object):
         obj_t = self.method.split('.')[0].upper()
         result = self.data['result']['net']
 
-        data = []
-
-        for item in result:
-            props = [('{#VSPHERE.' + obj_t + '.' + k.upper() + '}', v) for k, v in item.items()]
-            data.append(dict(props))
-
-        return {'data': data}
+        return {'data': self._lld_items(obj_t, result)}
 
     def zabbix_vm_process_get(self):
         """
@@ -282,9 +277,33 @@ class HelperAgent(object):
         method_name = '.'.join(m).upper()
         result = self.data['result']
 
+        return {'data': self._lld_items(method_name, result)}
+
+    def _lld_items(self, prefix, items):
+        """
+        Translates the attribute names of each item to Zabbix macros
+
+        The items of a result usually share the same attribute names,
+        so the macro for each attribute name is built only once.
+
+        Args:
+            prefix (str): The macro prefix, e.g. 'VM' or 'HOST'
+            items (list): The items to be translated
+
+        Returns:
+            A list of items with attribute names in Zabbix macro format
+
+        """
+        macros = {}
         data = []
-        for item in result:
-            props = [('{#VSPHERE.' + method_name + '.' + k.upper() + '}', v) for k, v in item.items()]
-            data.append(dict(props))
 
-        return {'data': data}
+        for item in items:
+            props = {}
+            for k, v in item.items():
+                macro = macros.get(k)
+                if macro is None:
+                    macro = macros[k] = '{#VSPHERE.' + prefix + '.' + k.upper() + '}'
+                props[macro] = v
+            data.append(props)
+
+        return data
@@ -0,0 +1,204 @@
+# Copyright (c) 2013-2015 Marin Atanasov Nikolov <dnaeon@gmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer
+#    in this position and unchanged.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR(S) ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR(S) BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+vPoller Manager module
+
+Provides the management interface shared by the
+vPoller Proxy and Worker Managers.
+
+"""
+
+import multiprocessing
+
+from platform import node
+
+try:
+    from ConfigParser import ConfigParser
+except ImportError:
+    from configparser import ConfigParser
+
+import zmq
+
+from vpoller import codec
+from vpoller.log import logger
+
+__all__ = ['VPollerManager']
+
+
+class VPollerManager(object):
+    """
+    Base class for the vPoller Managers
+
+    Implements loading of the configuration file and the management
+    interface of a vPoller Manager. Subclasses provide the
+    'config_defaults' and extend the status() method.
+
+    """
+    name = 'Manager'
+
+    def __init__(self, config_file):
+        """
+        Initializes a new vPoller Manager
+
+        Args:
+            config_file (str): Path to the vPoller configuration file
+
+        """
+        self.node = node()
+        self.config_file = config_file
+        self.config = {}
+        self.config_defaults = {}
+        self.time_to_die = multiprocessing.Event()
+        self.zcontext = None
+        self.zpoller = None
+        self.mgmt_socket = None
+        self.mgmt_methods = {
+            'status': self.status,
+            'shutdown': self.signal_stop,
+        }
+
+    def signal_stop(self):
+        """
+        Signal the vPoller Manager that shutdown time has arrived
+
+        """
+        logger.info('Received shutdown signal')
+        self.time_to_die.set()
+
+        return {'success': 0, 'msg': 'Shutdown time has arrived'}
+
+    def read_config(self):
+        """
+        Reads the vPoller configuration file
+
+        Returns:
+            A ConfigParser instance with the configuration settings
+
+        """
+        logger.debug('Loading config file %s', self.config_file)
+
+        parser = ConfigParser(self.config_defaults)
+        with open(self.config_file) as f:
+            if hasattr(parser, 'read_file'):
+                parser.read_file(f)
+            else:
+                parser.readfp(f)
+
+        return parser
+
+    def create_sockets(self):
+        """
+        Creates the ZeroMQ sockets used by the vPoller Manager
+
+        """
+        logger.debug('Creating %s sockets', self.name)
+
+        self.zcontext = zmq.Context()
+        self.mgmt_socket = self.zcontext.socket(zmq.REP)
+        # Leave time for the reply to a shutdown request to be sent,
+        # but do not block the shutdown if the client has gone away
+        self.mgmt_socket.setsockopt(zmq.LINGER, 1000)
+        self.mgmt_socket.bind(self.config.get('mgmt'))
+        self.zpoller = zmq.Poller()
+        self.zpoller.register(self.mgmt_socket, zmq.POLLIN)
+
+    def close_sockets(self):
+        """
+        Closes the ZeroMQ sockets used by the vPoller Manager
+
+        """
+        logger.debug('Closing %s sockets', self.name)
+
+        self.zpoller.unregister(self.mgmt_socket)
+        self.mgmt_socket.close()
+        self.zcontext.term()
+
+    def wait_for_mgmt_task(self):
+        """
+        Poll the management socket for management tasks
+
+        """
+        # The management socket is the only registered socket
+        if self.zpoller.poll():
+            try:
+                msg = codec.loads(self.mgmt_socket.recv())
+            except (TypeError, ValueError):
+                logger.warning(
+                    'Invalid message received on management interface',
+                )
+                self.mgmt_socket.send(
+                    codec.dumps({'success': 1, 'msg': 'Invalid message received'})
+                )
+                return
+
+            result = self.process_mgmt_task(msg)
+            self.mgmt_socket.send(codec.dumps(result))
+
+    def process_mgmt_task(self, msg):
+        """
+        Processes a message for the management interface
+
+        Example client message to shutdown the vPoller Manager would be:
+
+            {
+                "method": "shutdown"
+            }
+
+        Args:
+            msg (dict): The client message for processing
+
+        """
+        logger.debug('Processing management message: %s', msg)
+
+        if not isinstance(msg, dict) or 'method' not in msg:
+            return {'success': 1, 'msg': 'Missing method name'}
+
+        if msg['method'] not in self.mgmt_methods:
+            return {'success': 1, 'msg': 'Unknown method name received'}
+
+        method = msg['method']
+        result = self.mgmt_methods[method]()
+
+        return result
+
+    def status(self):
+        """
+        Get status information about the vPoller Manager
+
+        Subclasses extend the result with their own settings.
+
+        """
+        result = {
+            'success': 0,
+            'msg': 'vPoller {} status'.format(self.name),
+            'result': {
+                'status': 'running',
+                'hostname': self.node,
+                'mgmt': self.config.get('mgmt'),
+            }
+        }
+
+        return result
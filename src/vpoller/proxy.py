@@ -27,26 +27,26 @@ vPoller Proxy module for the VMware vSphere Poller
 
 """
 
+import threading
 import multiprocessing
 
-from platform import node
-
-try:
-    from ConfigParser import ConfigParser
-except ImportError:
-    from configparser import ConfigParser
-
 import zmq
 
 from vpoller import __version__
 from vpoller.log import logger
+from vpoller.manager import VPollerManager
 
 
-class VPollerProxyManager(object):
+class VPollerProxyManager(VPollerManager):
     """
     Manager of vPoller Proxy
 
+    Extends:
+        VPollerManager
+
     """
+    name = 'Proxy Manager'
+
     def __init__(self, config_file):
         """
         Initializes a new vPoller Proxy Manager
@@ -55,21 +55,13 @@ class VPollerProxyManager(object):
             config_file (str): Path to the vPoller configuration file
 
         """
-        self.node = node()
-        self.config_file = config_file
-        self.config = {}
+        super(VPollerProxyManager, self).__init__(config_file)
         self.config_defaults = {
             'mgmt': 'tcp://*:9999',
             'frontend': 'tcp://*:10123',
             'backend': 'tcp://*:10124',
-        }
-        self.time_to_die = multiprocessing.Event()
-        self.zcontext = None
-        self.zpoller = None
-        self.mgmt_socket = None
-        self.mgmt_methods = {
-            'status': self.status,
-            'shutdown': self.signal_stop,
+            'hwm': '1000',
+            'io_threads': '1',
         }
         self.proxy = None
 
@@ -102,29 +94,18 @@ class VPollerProxyManager(object):
         self.close_sockets()
         self.stop_proxy_process()
 
-    def signal_stop(self):
-        """
-        Signal the Proxy Manager that shutdown time has arrived
-
-        """
-        logger.info('Received shutdown signal')
-        self.time_to_die.set()
-        
-        return {'success': 0, 'msg': 'Shutdown time has arrived'}
-
     def load_config(self):
         """
         Load the vPoller Proxy Manager configuration settings
 
         """
-        logger.debug('Loading config file %s', self.config_file)
-
-        parser = ConfigParser(self.config_defaults)
-        parser.read(self.config_file)
+        parser = self.read_config()
 
         self.config['mgmt'] = parser.get('proxy', 'mgmt')
         self.config['frontend'] = parser.get('proxy', 'frontend')
         self.config['backend'] = parser.get('proxy', 'backend')
+        self.config['hwm'] = parser.getint('proxy', 'hwm')
+        self.config['io_threads'] = parser.getint('proxy', 'io_threads')
 
         logger.debug(
             'Proxy Manager configuration: %s',
@@ -140,7 +121,9 @@ class VPollerProxyManager(object):
 
         self.proxy = VPollerProxy(
             frontend=self.config.get('frontend'),
-            backend=self.config.get('backend')
+            backend=self.config.get('backend'),
+            hwm=self.config.get('hwm'),
+            io_threads=self.config.get('io_threads')
         )
         self.proxy.daemon = True
         self.proxy.start()
@@ -155,96 +138,17 @@ class VPollerProxyManager(object):
         self.proxy.signal_stop()
         self.proxy.join(3)
 
-    def create_sockets(self):
-        """
-        Creates the ZeroMQ sockets used by the vPoller Proxy Manager
-
-        """
-        logger.info('Creating Proxy Manager sockets')
-        self.zcontext = zmq.Context()
-        self.mgmt_socket = self.zcontext.socket(zmq.REP)
-        self.mgmt_socket.bind(self.config.get('mgmt'))
-        self.zpoller = zmq.Poller()
-        self.zpoller.register(self.mgmt_socket, zmq.POLLIN)
-
-    def close_sockets(self):
-        """
-        Closes the ZeroMQ sockets used by the vPoller Proxy Manager
-
-        """
-        logger.info('Closing Proxy Manager sockets')
-        self.zpoller.unregister(self.mgmt_socket)
-        self.mgmt_socket.close()
-        self.zcontext.term()
-
-    def wait_for_mgmt_task(self):
-        """
-        Poll the management socket for management tasks
-
-        """
-        socks = dict(self.zpoller.poll())
-        if socks.get(self.mgmt_socket) == zmq.POLLIN:
-            try:
-                msg = self.mgmt_socket.recv_json()
-            except TypeError:
-                logger.warning(
-                    'Invalid management message received',
-                )
-                self.mgmt_socket.send('Invalid message received')
-                return
-
-            result = self.process_mgmt_task(msg)
-            self.mgmt_socket.send_json(result)
-
-    def process_mgmt_task(self, msg):
-        """
-        Processes a message for the management interface
-
-        Example client message to shutdown Proxy Manager would be:
-
-            {
-                "method": "shutdown"
-            }
-
-        Args:
-            msg (dict): The client message for processing
-
-        """
-        logger.debug('Processing management message: %s', msg)
-
-        if 'method' not in msg:
-            return {
-                'success': 1,
-                'msg': 'Missing method name'
-            }
-
-        if msg['method'] not in self.mgmt_methods:
-            return {
-                'success': 1,
-                'msg': 'Uknown method name received'
-            }
-
-        method = msg['method']
-        result = self.mgmt_methods[method]()
-
-        return result
-
     def status(self):
         """
         Get status information about the vPoller Proxy
 
         """
-        result = {
-            'success': 0,
-            'msg': 'vPoller Proxy status',
-            'result': {
-                'status': 'running',
-                'hostname': self.node,
-                'mgmt': self.config.get('mgmt'),
-                'frontend': self.config.get('frontend'),
-                'backend': self.config.get('backend'),
-            }
-        }
+        result = super(VPollerProxyManager, self).status()
+        result['msg'] = 'vPoller Proxy status'
+        result['result'].update({
+            'frontend': self.config.get('frontend'),
+            'backend': self.config.get('backend'),
+        })
 
         return result
 
@@ -262,13 +166,15 @@ class VPollerProxy(multiprocessing.Process):
         run() method
 
     """
-    def __init__(self, frontend, backend):
+    def __init__(self, frontend, backend, hwm=1000, io_threads=1):
         """
         Initialize a new VPollerProxy process
 
         Args:
-            frontend (str): Endpoint to which clients connect
-            backend  (str): Endpoint to which workers connect
+            frontend   (str): Endpoint to which clients connect
+            backend    (str): Endpoint to which workers connect
+            hwm        (int): High water mark of the frontend and backend sockets
+            io_threads (int): Number of I/O threads of the ZeroMQ context
 
         """
         super(VPollerProxy, self).__init__()
@@ -276,17 +182,23 @@ class VPollerProxy(multiprocessing.Process):
         self.config = {
             'frontend': frontend,
             'backend': backend,
+            'hwm': hwm,
+            'io_threads': io_threads,
             }
         self.zcontext = None
-        self.zpoller = None
         self.frontend = None
         self.backend = None
+        self.watcher = None
 
     def run(self):
         logger.info('Proxy process is starting')
 
         self.create_sockets()
 
+        self.watcher = threading.Thread(target=self.wait_for_stop)
+        self.watcher.daemon = True
+        self.watcher.start()
+
         logger.info('Proxy process is ready and running')
         while not self.time_to_die.is_set():
             try:
@@ -311,40 +223,30 @@ class VPollerProxy(multiprocessing.Process):
         """
         self.time_to_die.set()
 
+    def wait_for_stop(self):
+        """
+        Terminates the ZeroMQ context once a shutdown is signaled
+
+        The messages are forwarded by libzmq, so terminating the
+        context is what interrupts the forwarding of messages.
+
+        """
+        self.time_to_die.wait()
+        self.zcontext.term()
+
     def distribute_tasks(self):
         """
         Distributes tasks from clients to workers for processing
 
+        The messages are forwarded between the frontend and backend
+        sockets by libzmq, without passing each frame through Python.
+        Returns once the ZeroMQ context has been terminated.
+
         """
-        socks = dict(self.zpoller.poll(1000))
-
-        # Forward task from frontend to backend socket
-        if socks.get(self.frontend) == zmq.POLLIN:
-            logger.debug('Message received on frontend socket')
-            task = self.frontend.recv()
-            more = self.frontend.getsockopt(zmq.RCVMORE)
-            if more:
-                self.backend.send(task, zmq.SNDMORE)
-            else:
-                self.backend.send(task)
-            logger.debug(
-                'Sending message to backend socket: %s',
-                task
-            )
-
-        # Forward result from backend to frontend socket
-        if socks.get(self.backend) == zmq.POLLIN:
-            logger.debug('Message received on backend socket')
-            result = self.backend.recv()
-            more = self.backend.getsockopt(zmq.RCVMORE)
-            if more:
-                self.frontend.send(result, zmq.SNDMORE)
-            else:
-                self.frontend.send(result)
-            logger.debug(
-                'Sending message to frontend socket: %s',
-                result
-            )
+        try:
+            zmq.proxy(self.frontend, self.backend)
+        except zmq.ContextTerminated:
+            pass
 
     def create_sockets(self):
         """
@@ -352,15 +254,21 @@ class VPollerProxy(multiprocessing.Process):
 
         """
         logger.info('Creating Proxy process sockets')
-        
-        self.zcontext = zmq.Context()
+
+        self.zcontext = zmq.Context(io_threads=self.config.get('io_threads'))
         self.frontend = self.zcontext.socket(zmq.ROUTER)
         self.backend = self.zcontext.socket(zmq.DEALER)
+
+        for socket in (self.frontend, self.backend):
+            socket.setsockopt(zmq.SNDHWM, self.config.get('hwm'))
+            socket.setsockopt(zmq.RCVHWM, self.config.get('hwm'))
+            socket.setsockopt(zmq.TCP_KEEPALIVE, 1)
+            # Do not wait for pending messages to be delivered when
+            # the context is terminated, clients retry their requests
+            socket.setsockopt(zmq.LINGER, 0)
+
         self.frontend.bind(self.config.get('frontend'))
         self.backend.bind(self.config.get('backend'))
-        self.zpoller = zmq.Poller()
-        self.zpoller.register(self.frontend, zmq.POLLIN)
-        self.zpoller.register(self.backend, zmq.POLLIN)
 
     def close_sockets(self):
         """
@@ -369,8 +277,9 @@ class VPollerProxy(multiprocessing.Process):
         """
         logger.info('Closing Proxy process sockets')
 
-        self.zpoller.unregister(self.frontend)
-        self.zpoller.unregister(self.backend)
         self.frontend.close()
         self.backend.close()
-        self.zcontext.term()
+
+        # The context is terminated by the watcher thread,
+        # which completes once all sockets have been closed
+        self.watcher.join()
@@ -43,4 +43,4 @@ class Task(object):
 
         self.name = name
         self.function = function
-        self.required = required
+        self.required = frozenset(required or ())
@@ -0,0 +1,106 @@
+# Copyright (c) 2013-2015 Marin Atanasov Nikolov <dnaeon@gmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer
+#    in this position and unchanged.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR(S) ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR(S) BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+vPoller Throttle module
+
+"""
+
+import time
+import threading
+
+from vpoller.log import logger
+
+__all__ = ['Throttle']
+
+
+class Throttle(object):
+    """
+    Throttle class
+
+    Limits the rate of requests sent to a vSphere host.
+
+    The rate is adjusted based on how the vSphere host is coping
+    with the load - when a request is slow or fails the rate
+    is halved, and after each successful request the rate is
+    slowly increased until it reaches the configured limit again.
+
+    """
+    def __init__(self, name, max_rps, slow_request=5):
+        """
+        Initializes a new Throttle object
+
+        Args:
+            name           (str): Name of the throttle, used in log messages
+            max_rps      (float): Maximum number of requests per second
+            slow_request (float): Time in seconds after which a request
+                                  is considered as slow
+
+        """
+        self.name = name
+        self.max_rps = float(max_rps)
+        self.min_rps = self.max_rps / 32
+        self.slow_request = slow_request
+        self.rate = self.max_rps
+        self.next_request = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """
+        Blocks until the next request is allowed to be sent
+
+        """
+        with self._lock:
+            now = time.time()
+            start = max(now, self.next_request)
+            self.next_request = start + 1 / self.rate
+
+        if start > now:
+            time.sleep(start - now)
+
+    def update(self, elapsed, failed=False):
+        """
+        Adjusts the rate based on the outcome of the last request
+
+        Args:
+            elapsed (float): Time in seconds the request took
+            failed   (bool): Whether the request failed
+
+        """
+        with self._lock:
+            self._update(elapsed, failed)
+
+    def _update(self, elapsed, failed):
+        if failed or elapsed > self.slow_request:
+            rate = max(self.rate / 2, self.min_rps)
+            if rate < self.rate:
+                logger.warning(
+                    '[%s] vSphere host is under load, throttling requests to %.2f per second',
+                    self.name,
+                    rate
+                )
+            self.rate = rate
+        elif self.rate < self.max_rps:
+            self.rate = min(self.rate + self.min_rps, self.max_rps)
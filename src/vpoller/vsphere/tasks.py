@@ -33,13 +33,530 @@ which this module is using please check the link below:
 """
 
 
+import time
+import threading
+
+from contextlib import closing
+
 import pyVmomi
 
 from vpoller.log import logger
+from vpoller.exceptions import VPollerException
 from vpoller.task.decorators import task
 
+try:
+    string_types = (str, unicode)
+except NameError:
+    string_types = (str,)
+
+# Maximum number of objects returned by the vSphere host in a single
+# page of results when collecting properties
+MAX_OBJECTS_PER_PAGE = 1000
+
+# Properties required for calculating the CPU usage of a Virtual Machine
+VM_CPU_USAGE_PROPERTIES = [
+    'name',
+    'runtime.host',
+    'summary.quickStats.overallCpuUsage',
+    'config.hardware.numCoresPerSocket',
+    'config.hardware.numCPU',
+]
+
+# Properties required for getting the VSAN health state of a host
+HOST_VSAN_HEALTH_PROPERTIES = [
+    'name',
+    'runtime.powerState',
+    'runtime.connectionState',
+]
+
+# Properties of the established sessions returned by session.get
+SESSION_PROPERTIES = [
+    'key',
+    'userName',
+    'fullName',
+    'loginTime',
+    'lastActiveTime',
+    'ipAddress',
+    'userAgent',
+    'callCount',
+]
+
+# Container views are kept for the lifetime of a vSphere session,
+# so that they are not created and destroyed on every request
+_container_views = {}
+_container_views_lock = threading.Lock()
+
+# Index of managed object references by property value,
+# e.g. VirtualMachine name -> vim.VirtualMachine, kept per vSphere session
+_object_index = {}
+_object_index_lock = threading.Lock()
+
+# Locks held while an index of managed objects is being built, so
+# that concurrent requests wait for a single traversal of the inventory
+_object_index_build_locks = {}
+
+# Supported performance counters indexed by counter id
+# and by counter name, kept per vSphere session
+_perf_counters = {}
+_perf_counters_lock = threading.Lock()
+
+# Minimum age in seconds of an index of managed objects before it is
+# rebuilt because an object cannot be found in it. Bursts of requests
+# for unknown objects then share a single traversal of the inventory.
+MIN_OBJECT_INDEX_AGE = 5
+
+# PropertySpecs are built once for each managed object type
+# and set of properties, as polls keep requesting the same ones.
+# The properties come from client messages, so the number of
+# cached PropertySpecs is bounded.
+MAX_PROPERTY_SPECS = 1024
+
+_property_specs = {}
+_property_specs_lock = threading.Lock()
+
+
+def _collect_properties(agent,
+                        view_ref,
+                        obj_type,
+                        path_set=None,
+                        include_mors=False):
+    """
+    Helper method for collecting properties of managed objects in a view
+
+    Unlike VConnector.collect_properties() which retrieves all
+    objects in a single response, the properties are retrieved using
+    RetrievePropertiesEx() in pages of MAX_OBJECTS_PER_PAGE objects.
+    This keeps the size of each response from the vSphere host
+    bounded, regardless of the size of the inventory.
+
+    Args:
+        agent              (VConnector): A VConnector instance
+        view_ref   (pyVmomi.vim.view.*): The view to collect properties from
+        obj_type        (pyVmomi.vim.*): Type of vSphere managed object
+        path_set                 (list): Properties to be collected, if not
+                                         specified all properties are collected
+        include_mors             (bool): If True include the managed object
+                                         reference under the 'obj' key
+
+    Returns:
+        A list of dicts with the collected properties of each object
+
+    """
+    return list(
+        _iter_collect_properties(
+            agent=agent,
+            view_ref=view_ref,
+            obj_type=obj_type,
+            path_set=path_set,
+            include_mors=include_mors
+        )
+    )
+
+def _iter_collect_properties(agent,
+                             view_ref,
+                             obj_type,
+                             path_set=None,
+                             include_mors=False):
+    """
+    Helper method for iterating over the properties of objects in a view
+
+    The properties are yielded as soon as a page of results is
+    received, so that callers can stop early once they have found
+    what they are looking for. Closing the iterator before it is
+    exhausted cancels the retrieval of the remaining pages.
+
+    Args:
+        agent              (VConnector): A VConnector instance
+        view_ref   (pyVmomi.vim.view.*): The view to collect properties from
+        obj_type        (pyVmomi.vim.*): Type of vSphere managed object
+        path_set                 (list): Properties to be collected, if not
+                                         specified all properties are collected
+        include_mors             (bool): If True include the managed object
+                                         reference under the 'obj' key
+
+    Returns:
+        An iterator of dicts with the collected properties of each object
+
+    """
+    PropertyCollector = pyVmomi.vmodl.query.PropertyCollector
+
+    traversal_spec = PropertyCollector.TraversalSpec(
+        name='traverseEntities',
+        path='view',
+        skip=False,
+        type=view_ref.__class__
+    )
+
+    obj_spec = PropertyCollector.ObjectSpec(
+        obj=view_ref,
+        skip=True,
+        selectSet=[traversal_spec]
+    )
+
+    return _iter_properties(
+        agent=agent,
+        obj_specs=[obj_spec],
+        obj_type=obj_type,
+        path_set=path_set,
+        include_mors=include_mors
+    )
+
+def _collect_object_properties(agent,
+                               objects,
+                               obj_type,
+                               path_set=None,
+                               include_mors=False):
+    """
+    Helper method for collecting properties of known managed objects
+
+    The managed objects are passed directly to the property collector,
+    which saves the round-trips for creating and destroying a
+    ListView of the objects.
+
+    Args:
+        agent       (VConnector): A VConnector instance
+        objects           (list): The managed objects to collect properties from
+        obj_type (pyVmomi.vim.*): Type of vSphere managed object
+        path_set          (list): Properties to be collected, if not
+                                  specified all properties are collected
+        include_mors      (bool): If True include the managed object
+                                  reference under the 'obj' key
+
+    Returns:
+        A list of dicts with the collected properties of each object
 
-def _discover_objects(agent, properties, obj_type):
+    """
+    # The property collector rejects filters without any objects
+    if not objects:
+        return []
+
+    ObjectSpec = pyVmomi.vmodl.query.PropertyCollector.ObjectSpec
+
+    return list(
+        _iter_properties(
+            agent=agent,
+            obj_specs=[ObjectSpec(obj=obj, skip=False) for obj in objects],
+            obj_type=obj_type,
+            path_set=path_set,
+            include_mors=include_mors
+        )
+    )
+
+def _collect_object_property(agent, objects, obj_type, property_name):
+    """
+    Helper method for collecting a single property of many managed objects
+
+    The property of all objects is collected with a single request,
+    instead of a separate request for each object.
+
+    Args:
+        agent       (VConnector): A VConnector instance
+        objects           (list): The managed objects to collect the property from
+        obj_type (pyVmomi.vim.*): Type of vSphere managed object
+        property_name      (str): Name of the property to collect
+
+    Returns:
+        A dict mapping each managed object to the value of its property
+
+    """
+    data = _collect_object_properties(
+        agent=agent,
+        objects=list(set(objects)),
+        obj_type=obj_type,
+        path_set=[property_name],
+        include_mors=True
+    )
+
+    return {props['obj']: props.get(property_name) for props in data}
+
+def _iter_properties(agent, obj_specs, obj_type, path_set, include_mors):
+    """
+    Helper method for retrieving properties using RetrievePropertiesEx()
+
+    If the iterator is closed before all pages have been
+    retrieved, the retrieval is cancelled on the vSphere host,
+    so that it can release the remaining results.
+
+    Args:
+        agent       (VConnector): A VConnector instance
+        obj_specs         (list): The ObjectSpecs to retrieve properties for
+        obj_type (pyVmomi.vim.*): Type of vSphere managed object
+        path_set          (list): Properties to be collected, if not
+                                  specified all properties are collected
+        include_mors      (bool): If True include the managed object
+                                  reference under the 'obj' key
+
+    Returns:
+        An iterator of dicts with the collected properties of each object
+
+    """
+    PropertyCollector = pyVmomi.vmodl.query.PropertyCollector
+
+    filter_spec = PropertyCollector.FilterSpec(
+        objectSet=obj_specs,
+        propSet=[_get_property_spec(obj_type, path_set)]
+    )
+
+    options = PropertyCollector.RetrieveOptions(maxObjects=MAX_OBJECTS_PER_PAGE)
+
+    collector = agent.si.content.propertyCollector
+    result = collector.RetrievePropertiesEx([filter_spec], options)
+
+    token = None
+    try:
+        while result:
+            token = result.token
+            for obj in result.objects:
+                properties = {prop.name: prop.val for prop in obj.propSet}
+                if include_mors:
+                    properties['obj'] = obj.obj
+                yield properties
+
+            if not token:
+                break
+
+            result = collector.ContinueRetrievePropertiesEx(token=token)
+            token = None
+    finally:
+        if token:
+            try:
+                collector.CancelRetrievePropertiesEx(token=token)
+            except Exception as e:
+                logger.debug('[%s] Cannot cancel property retrieval: %s', agent.host, e)
+
+def _get_property_spec(obj_type, path_set):
+    """
+    Helper method for getting a PropertySpec for a managed object type
+
+    Args:
+        obj_type (pyVmomi.vim.*): Type of vSphere managed object
+        path_set          (list): Properties to be collected, if not
+                                  specified all properties are collected
+
+    Returns:
+        A PropertySpec for the given managed object type and properties
+
+    """
+    key = (obj_type, tuple(path_set) if path_set else None)
+
+    with _property_specs_lock:
+        property_spec = _property_specs.get(key)
+        if property_spec is None:
+            property_spec = pyVmomi.vmodl.query.PropertyCollector.PropertySpec(type=obj_type)
+            if path_set:
+                property_spec.pathSet = list(path_set)
+            else:
+                property_spec.all = True
+            if len(_property_specs) < MAX_PROPERTY_SPECS:
+                _property_specs[key] = property_spec
+
+    return property_spec
+
+def _get_container_view(agent, obj_type, datacenter=None):
+    """
+    Helper method for getting a container view for a managed object type
+
+    The container view is created once per vSphere session and
+    reused by subsequent requests. A new view is created when the
+    agent has established a new session, as views do not
+    outlive the session in which they were created.
+
+    If a datacenter is specified the view contains only the
+    managed objects from that datacenter, otherwise the view
+    contains all managed objects of the given type.
+
+    Args:
+        agent       (VConnector): A VConnector instance
+        obj_type (pyVmomi.vim.*): Type of vSphere managed object
+        datacenter         (str): Name of the datacenter to limit the view to
+
+    Returns:
+        A container view for the managed object type
+
+    Raises:
+        VPollerException
+
+    """
+    container = None
+    if datacenter:
+        container = _find_object(
+            agent=agent,
+            property_name='name',
+            property_value=datacenter,
+            obj_type=pyVmomi.vim.Datacenter
+        )
+        if container is None:
+            raise VPollerException('Cannot find datacenter {}'.format(datacenter))
+
+    key = (agent.host, obj_type, datacenter)
+
+    with _container_views_lock:
+        si, view_ref = _container_views.get(key, (None, None))
+        if view_ref is None or si is not agent.si:
+            if container is None:
+                view_ref = agent.get_container_view(obj_type=[obj_type])
+            else:
+                view_ref = agent.si.content.viewManager.CreateContainerView(
+                    container=container,
+                    type=[obj_type],
+                    recursive=True
+                )
+            _container_views[key] = (agent.si, view_ref)
+
+    return view_ref
+
+def _build_object_index(agent, obj_type, property_name):
+    """
+    Helper method for indexing managed objects by a property value
+
+    Args:
+        agent       (VConnector): A VConnector instance
+        obj_type (pyVmomi.vim.*): Type of vSphere managed object
+        property_name      (str): Name of the property to index on
+
+    If several objects share the same property value, the first
+    one collected is kept in the index.
+
+    Returns:
+        A dict mapping property values to managed object references
+
+    """
+    logger.debug(
+        '[%s] Indexing %s managed objects by %s',
+        agent.host,
+        obj_type.__name__,
+        property_name
+    )
+
+    view_ref = _get_container_view(agent, obj_type)
+    data = _collect_properties(
+        agent=agent,
+        view_ref=view_ref,
+        obj_type=obj_type,
+        path_set=[property_name],
+        include_mors=True
+    )
+
+    index = {}
+    for props in data:
+        if property_name in props:
+            index.setdefault(props[property_name], props['obj'])
+
+    return index
+
+def _get_object_by_property(agent, property_name, property_value, obj_type):
+    """
+    Helper method for finding a managed object by a property value
+
+    Instead of walking the whole inventory on each request, the
+    managed objects are indexed by the property value once per
+    vSphere session. The index is rebuilt when the object cannot
+    be found in it, as it may have been created in the meantime,
+    unless the index is younger than MIN_OBJECT_INDEX_AGE seconds.
+    Concurrent requests share a single rebuild of the index.
+
+    Args:
+        agent       (VConnector): A VConnector instance
+        property_name      (str): Property name used for searching for the object
+        property_value     (str): Property value identifying the object in question
+        obj_type (pyVmomi.vim.*): Type of vSphere managed object
+
+    Returns:
+        The managed object reference or None if not found
+
+    """
+    key = (agent.host, obj_type, property_name)
+
+    with _object_index_lock:
+        si, built_at, index = _object_index.get(key, (None, 0, None))
+        build_lock = _object_index_build_locks.setdefault(key, threading.Lock())
+
+    if index is not None and si is agent.si:
+        obj = index.get(property_value)
+        if obj is not None or time.time() - built_at < MIN_OBJECT_INDEX_AGE:
+            return obj
+
+    seen_built_at = built_at
+    with build_lock:
+        # The index may have been rebuilt while waiting for the lock
+        with _object_index_lock:
+            si, built_at, index = _object_index.get(key, (None, 0, None))
+        if index is not None and si is agent.si and built_at > seen_built_at:
+            return index.get(property_value)
+
+        si = agent.si
+        built_at = time.time()
+        index = _build_object_index(agent, obj_type, property_name)
+        with _object_index_lock:
+            _object_index[key] = (si, built_at, index)
+
+    return index.get(property_value)
+
+def _forget_object_index(agent, obj_type, property_name):
+    """
+    Helper method for dropping an index of managed objects
+
+    Used when an indexed managed object reference turns out to be
+    stale, e.g. the object has been removed from the inventory.
+
+    Args:
+        agent       (VConnector): A VConnector instance
+        obj_type (pyVmomi.vim.*): Type of vSphere managed object
+        property_name      (str): Name of the indexed property
+
+    """
+    with _object_index_lock:
+        _object_index.pop((agent.host, obj_type, property_name), None)
+
+
+def _find_object(agent, property_name, property_value, obj_type):
+    """
+    Helper method for finding a managed object by a property value
+
+    Unlike _get_object_by_property() the managed object reference
+    found in the index is verified to still have the requested
+    property value. If the object has been renamed or removed in
+    the meantime, the object is looked up again in a fresh index.
+
+    Args:
+        agent       (VConnector): A VConnector instance
+        property_name      (str): Property name used for searching for the object
+        property_value     (str): Property value identifying the object in question
+        obj_type (pyVmomi.vim.*): Type of vSphere managed object
+
+    Returns:
+        The managed object reference or None if not found
+
+    """
+    for _ in range(2):
+        obj = _get_object_by_property(
+            agent=agent,
+            property_name=property_name,
+            property_value=property_value,
+            obj_type=obj_type
+        )
+
+        if obj is None:
+            return None
+
+        try:
+            data = _collect_object_properties(
+                agent=agent,
+                objects=[obj],
+                obj_type=obj_type,
+                path_set=[property_name]
+            )
+        except Exception:
+            data = None
+
+        if data and data[0].get(property_name) == property_value:
+            return obj
+
+        _forget_object_index(agent, obj_type, property_name)
+
+    return None
+
+def _discover_objects(agent, properties, obj_type, datacenter=None):
     """
     Helper method to simplify discovery of vSphere managed objects
 
@@ -51,28 +568,28 @@ def _discover_objects(agent, properties, obj_type):
         agent         (VConnector): Instance of VConnector
         properties          (list): Properties to be collected
         obj_type   (pyVmomi.vim.*): Type of vSphere managed object
+        datacenter           (str): Discover only the objects from this datacenter
 
     Returns:
         The discovered objects in JSON format
 
     """
-    logger.info(
+    logger.debug(
         '[%s] Discovering %s managed objects',
         agent.host,
         obj_type.__name__
     )
 
-    view_ref = agent.get_container_view(obj_type=[obj_type])
     try:
-        data = agent.collect_properties(
+        view_ref = _get_container_view(agent, obj_type, datacenter)
+        data = _collect_properties(
+            agent=agent,
             view_ref=view_ref,
             obj_type=obj_type,
             path_set=properties
         )
     except Exception as e:
-        return {'success': 1, 'msg': 'Cannot collect properties: {}'.format(e.message)}
-
-    view_ref.DestroyView()
+        return {'success': 1, 'msg': 'Cannot collect properties: {}'.format(e)}
 
     result = {
         'success': 0,
@@ -94,9 +611,8 @@ def _get_object_properties(agent,
     This method is used by the '*.get' vPoller Worker methods and is
     meant for collecting properties for a single managed object.
 
-    We first search for the object with property name and value,
-    then create a list view for this object and
-    finally collect it's properties.
+    We first search for the object with property name and value
+    and then collect the properties of this object.
 
     Args:
         agent            (VConnector): A VConnector instance
@@ -109,51 +625,186 @@ def _get_object_properties(agent,
         The collected properties for this managed object in JSON format
 
     """
-    logger.info(
+    logger.debug(
         '[%s] Retrieving properties for %s managed object of type %s',
         agent.host,
         obj_property_value,
         obj_type.__name__
     )
 
-    # Find the Managed Object reference for the requested object
-    try:
-        obj = agent.get_object_by_property(
-            property_name=obj_property_name,
-            property_value=obj_property_value,
-            obj_type=obj_type
-        )
-    except Exception as e:
-        return {'success': 1, 'msg': 'Cannot collect properties: {}'.format(e.message)}
+    # The property used for finding the object is always collected,
+    # so that we can verify the indexed object is still the one requested
+    path_set = properties
+    if properties and obj_property_name not in properties:
+        path_set = list(properties) + [obj_property_name]
+
+    # The index may be stale, e.g. the object has been renamed or
+    # removed, in which case the object is looked up once more
+    # in a fresh index
+    for _ in range(2):
+        # Find the Managed Object reference for the requested object
+        try:
+            obj = _get_object_by_property(
+                agent=agent,
+                property_name=obj_property_name,
+                property_value=obj_property_value,
+                obj_type=obj_type
+            )
+        except Exception as e:
+            return {'success': 1, 'msg': 'Cannot collect properties: {}'.format(e)}
 
-    if not obj:
+        if not obj:
+            return {
+                'success': 1,
+                'msg': 'Cannot find object {}'.format(obj_property_value)
+            }
+
+        try:
+            data = _collect_object_properties(
+                agent=agent,
+                objects=[obj],
+                obj_type=obj_type,
+                path_set=path_set,
+                include_mors=include_mors
+            )
+        except Exception as e:
+            # The object may no longer exist, so make sure
+            # it is looked up again on the next request
+            _forget_object_index(agent, obj_type, obj_property_name)
+            return {'success': 1, 'msg': 'Cannot collect properties: {}'.format(e)}
+
+        if data and data[0].get(obj_property_name) == obj_property_value:
+            break
+
+        _forget_object_index(agent, obj_type, obj_property_name)
+    else:
         return {
             'success': 1,
             'msg': 'Cannot find object {}'.format(obj_property_value)
         }
 
-    # Create a list view for this object and collect properties
-    view_ref = agent.get_list_view(obj=[obj])
+    if path_set is not properties:
+        for props in data:
+            props.pop(obj_property_name, None)
+
+    result = {
+        'success': 0,
+        'msg': 'Successfully retrieved object properties',
+        'result': data,
+    }
+
+    return result
+
+def _get_objects_properties(agent,
+                            properties,
+                            obj_type,
+                            obj_property_name,
+                            obj_property_values,
+                            datacenter=None):
+    """
+    Helper method to simplify retrieving of properties for many objects
+
+    This method is used by the '*.batch.get' vPoller Worker methods and is
+    meant for collecting properties for multiple managed objects at once.
+
+    The properties of all requested objects are collected using a single
+    traversal of the inventory, instead of searching for and
+    collecting the properties of each object separately. The
+    traversal stops as soon as all requested objects have been found.
+
+    Args:
+        agent            (VConnector): A VConnector instance
+        properties             (list): List of properties to be collected
+        obj_type      (pyVmomi.vim.*): Type of vSphere managed object
+        obj_property_name       (str): Property name used for searching for the objects
+        obj_property_values    (list): Property values identifying the objects in question
+        datacenter              (str): Search only for objects from this datacenter
+
+    Returns:
+        The collected properties for the managed objects in JSON format,
+        the requested objects which cannot be found are listed in the
+        'missing' key of the result
+
+    """
+    logger.debug(
+        '[%s] Retrieving properties for %d managed objects of type %s',
+        agent.host,
+        len(obj_property_values),
+        obj_type.__name__
+    )
+
+    path_set = [obj_property_name]
+    path_set.extend(p for p in properties if p != obj_property_name)
+
+    result = []
+    remaining = set(obj_property_values)
 
     try:
-        data = agent.collect_properties(
+        view_ref = _get_container_view(agent, obj_type, datacenter)
+        objects = _iter_collect_properties(
+            agent=agent,
             view_ref=view_ref,
             obj_type=obj_type,
-            path_set=properties,
-            include_mors=include_mors
+            path_set=path_set
         )
+        with closing(objects):
+            for props in objects:
+                value = props.get(obj_property_name)
+                if value in remaining:
+                    result.append(props)
+                    remaining.discard(value)
+                    if not remaining:
+                        break
     except Exception as e:
-        return {'success': 1, 'msg': 'Cannot collect properties: {}'.format(e.message)}
+        return {'success': 1, 'msg': 'Cannot collect properties: {}'.format(e)}
 
-    view_ref.DestroyView()
+    if not result:
+        return {
+            'success': 1,
+            'msg': 'Cannot find objects {}'.format(', '.join(obj_property_values))
+        }
 
-    result = {
+    r = {
         'success': 0,
-        'msg': 'Successfully retrieved object properties',
-        'result': data,
+        'msg': 'Successfully retrieved objects properties',
+        'result': result,
     }
 
-    return result
+    # Report the requested objects which could not be found
+    if remaining:
+        missing = [v for v in obj_property_values if v in remaining]
+        r['msg'] = 'Retrieved objects properties, cannot find objects {}'.format(', '.join(missing))
+        r['missing'] = missing
+
+    return r
+
+def _get_batch_names(msg):
+    """
+    Get the names of the objects requested by a '*.batch.get' message
+
+    The names can be provided either as a list or as
+    a string of comma-separated names.
+
+    Args:
+        msg (dict): The client message
+
+    Returns:
+        The list of object names in the 'result' key, or an error
+        message if the names are not valid
+
+    """
+    names = msg['name']
+    if isinstance(names, string_types):
+        names = names.split(',')
+
+    if not isinstance(names, list) or not all(isinstance(n, string_types) for n in names):
+        return {'success': 1, 'msg': 'Object names must be a list or a comma-separated string'}
+
+    names = [name.strip() for name in names if name.strip()]
+    if not names:
+        return {'success': 1, 'msg': 'No object names provided'}
+
+    return {'success': 0, 'msg': 'Object names', 'result': names}
 
 def _object_datastore_get(agent, obj_type, name):
     """
@@ -196,17 +847,15 @@ def _object_datastore_get(agent, obj_type, name):
     props = data['result'][0]
     obj_datastores = props['datastore']
 
-    # Get a list view of the datastores available/used by
-    # this object and collect properties
-    view_ref = agent.get_list_view(obj=obj_datastores)
-    result = agent.collect_properties(
-        view_ref=view_ref,
+    # Collect properties of the datastores available/used by
+    # this object
+    result = _collect_object_properties(
+        agent=agent,
+        objects=obj_datastores,
         obj_type=pyVmomi.vim.Datastore,
         path_set=['name', 'info.url']
     )
 
-    view_ref.DestroyView()
-
     r = {
         'success': 0,
         'msg': 'Successfully discovered objects',
@@ -251,20 +900,36 @@ def _object_alarm_get(agent,
     if data['success'] != 0:
         return data
 
-    result = []
     props = data['result'][0]
     alarms = props['triggeredAlarmState']
-    for alarm in alarms:
-        a = {
+
+    # Accessing the alarm and entity names directly would result in
+    # a separate request to the vSphere host for each alarm
+    alarm_names = _collect_object_property(
+        agent=agent,
+        objects=[alarm.alarm for alarm in alarms],
+        obj_type=pyVmomi.vim.alarm.Alarm,
+        property_name='info.name'
+    )
+    entity_names = _collect_object_property(
+        agent=agent,
+        objects=[alarm.entity for alarm in alarms],
+        obj_type=pyVmomi.vim.ManagedEntity,
+        property_name='name'
+    )
+
+    result = [
+        {
             'key': str(alarm.key),
-            'info': alarm.alarm.info.name,
+            'info': alarm_names.get(alarm.alarm),
             'time': str(alarm.time),
-            'entity': alarm.entity.name,
+            'entity': entity_names.get(alarm.entity),
             'acknowledged': alarm.acknowledged,
             'overallStatus': alarm.overallStatus,
             'acknowledgedByUser': alarm.acknowledgedByUser,
         }
-        result.append(a)
+        for alarm in alarms
+    ]
 
     r = {
         'success': 0,
@@ -286,11 +951,9 @@ def _get_counter_by_id(agent, counter_id):
         A vim.PerformanceManager.CounterInfo instance
 
     """
-    for c in agent.perf_counter:
-        if c.key == counter_id:
-            return c
+    counters_by_id, _ = _get_perf_counters(agent)
 
-    return None
+    return counters_by_id.get(counter_id)
 
 def _get_counter_by_name(agent, name):
     """
@@ -308,12 +971,61 @@ def _get_counter_by_name(agent, name):
         A vim.PerformanceManager.CounterInfo instance
 
     """
-    for c in agent.perf_counter:
-        c_name = '{}.{}.{}.{}'.format(c.groupInfo.key, c.nameInfo.key, c.unitInfo.key, c.rollupType)
-        if name == c_name:
-            return c
+    _, counters_by_name = _get_perf_counters(agent)
 
-    return None
+    return counters_by_name.get(name)
+
+def _get_counter_name(counter):
+    """
+    Get the name of a counter
+
+    Args:
+        counter (vim.PerformanceManager.CounterInfo): A counter
+
+    Returns:
+        The counter name in <group>.<name>.<unit>.<rollup> form
+
+    """
+    return '{}.{}.{}.{}'.format(
+        counter.groupInfo.key,
+        counter.nameInfo.key,
+        counter.unitInfo.key,
+        counter.rollupType
+    )
+
+def _get_perf_counters(agent):
+    """
+    Get the supported performance counters indexed by id and name
+
+    The performance counters are retrieved once per vSphere
+    session, instead of on each counter lookup.
+
+    Args:
+        agent (VConnector): A VConnector instance
+
+    Returns:
+        A tuple of dicts mapping counter ids and counter names
+        to vim.PerformanceManager.CounterInfo instances
+
+    """
+    with _perf_counters_lock:
+        si, counters_by_id, counters_by_name = _perf_counters.get(
+            agent.host,
+            (None, None, None)
+        )
+
+    if counters_by_id is not None and si is agent.si:
+        return counters_by_id, counters_by_name
+
+    si = agent.si
+    counters = agent.perf_counter
+    counters_by_id = {c.key: c for c in counters}
+    counters_by_name = {_get_counter_name(c): c for c in counters}
+
+    with _perf_counters_lock:
+        _perf_counters[agent.host] = (si, counters_by_id, counters_by_name)
+
+    return counters_by_id, counters_by_name
 
 def _entity_perf_metric_info(agent, entity, counter_name=''):
     """
@@ -384,7 +1096,7 @@ def _entity_perf_metric_info(agent, entity, counter_name=''):
     for e in data:
         c_id = e['counterId']
         c_info = _get_counter_by_id(agent=agent, counter_id=c_id)
-        e['counterId'] = '{}.{}.{}.{}'.format(c_info.groupInfo.key, c_info.nameInfo.key, c_info.unitInfo.key, c_info.rollupType)
+        e['counterId'] = _get_counter_name(c_info)
 
     result = {
         'msg': 'Successfully retrieved performance metrics',
@@ -410,7 +1122,7 @@ def _entity_perf_metric_get(agent, entity, counter_name, max_sample=1, instance=
         The collected performance metrics from the managed object
 
     """
-    logger.info(
+    logger.debug(
         '[%s] Retrieving performance metric %s for %s',
         agent.host,
         counter_name,
@@ -452,7 +1164,8 @@ def _entity_perf_metric_get(agent, entity, counter_name, max_sample=1, instance=
     # are real-time only, so if you need historical statistics
     # make sure to pass a valid historical interval name.
     if interval_name:
-        if interval_name not in [i.name for i in agent.perf_interval]:
+        interval = next((i for i in agent.perf_interval if i.name == interval_name), None)
+        if interval is None:
             logger.warning(
                 '[%s] Historical interval %s does not exists',
                 agent.host,
@@ -460,7 +1173,7 @@ def _entity_perf_metric_get(agent, entity, counter_name, max_sample=1, instance=
             )
             return {'success': 1, 'msg': 'Historical interval {} does not exists'.format(interval_name)}
         else:
-            interval_id = [i for i in agent.perf_interval if i.name == interval_name].pop().samplingPeriod
+            interval_id = interval.samplingPeriod
     else:
         interval_id = provider_summary.refreshRate
 
@@ -543,7 +1256,7 @@ def about(agent, msg):
         The discovered objects in JSON format
 
     """
-    logger.info("[%s] Retrieving vSphere About information", agent.host)
+    logger.debug("[%s] Retrieving vSphere About information", agent.host)
 
     # If no properties are specified just return the 'fullName' property
     if 'properties' not in msg or not msg['properties']:
@@ -576,7 +1289,7 @@ def event_latest(agent, msg):
         The discovered objects in JSON format
 
     """
-    logger.info('[%s] Retrieving latest registered event', agent.host)
+    logger.debug('[%s] Retrieving latest registered event', agent.host)
 
     e = agent.si.content.eventManager.latestEvent.fullFormattedMessage
 
@@ -604,7 +1317,7 @@ def session_get(agent, msg):
         The established vSphere sessions in JSON format
 
     """
-    logger.info('[%s] Retrieving established sessions', agent.host)
+    logger.debug('[%s] Retrieving established sessions', agent.host)
 
     try:
         sm = agent.si.content.sessionManager
@@ -615,23 +1328,11 @@ def session_get(agent, msg):
             'success': 1
         }
 
-    # Session properties to be collected
-    props = [
-        'key',
-        'userName',
-        'fullName',
-        'loginTime',
-        'lastActiveTime',
-        'ipAddress',
-        'userAgent',
-        'callCount'
+    sessions = [
+        {k: str(getattr(session, k)) for k in SESSION_PROPERTIES}
+        for session in session_list
     ]
 
-    sessions = []
-    for session in session_list:
-        s = {k: str(getattr(session, k)) for k in props}
-        sessions.append(s)
-
     result = {
         'msg': 'Successfully retrieved sessions',
         'success': 0,
@@ -656,7 +1357,7 @@ def perf_metric_info(agent, msg):
         The list of supported performance counters by the vSphere host
 
     """
-    logger.info(
+    logger.debug(
         '[%s] Retrieving supported performance counters',
         agent.host
     )
@@ -699,7 +1400,7 @@ def perf_interval_info(agent, msg):
         The existing performance historical interval on the system
 
     """
-    logger.info(
+    logger.debug(
         '[%s] Retrieving existing performance historical intervals',
         agent.host
     )
@@ -751,7 +1452,8 @@ def net_discover(agent, msg):
     r = _discover_objects(
         agent=agent,
         properties=properties,
-        obj_type=pyVmomi.vim.Network
+        obj_type=pyVmomi.vim.Network,
+        datacenter=msg.get('datacenter')
     )
 
     return r
@@ -828,18 +1530,16 @@ def net_host_get(agent, msg):
     props = data['result'][0]
     network_name, network_hosts = props['name'], props['host']
 
-    # Create a list view for the HostSystem managed objects
-    view_ref = agent.get_list_view(obj=network_hosts)
+    # Collect properties of the HostSystem managed objects
     result = {}
     result['name'] = network_name
-    result['host'] = agent.collect_properties(
-        view_ref=view_ref,
+    result['host'] = _collect_object_properties(
+        agent=agent,
+        objects=network_hosts,
         obj_type=pyVmomi.vim.HostSystem,
         path_set=['name']
     )
 
-    view_ref.DestroyView()
-
     r = {
         'success': 0,
         'msg': 'Successfully discovered objects',
@@ -886,18 +1586,16 @@ def net_vm_get(agent, msg):
     props = data['result'][0]
     network_name, network_vms = props['name'], props['vm']
 
-    # Create a list view for the VirtualMachine managed objects
-    view_ref = agent.get_list_view(obj=network_vms)
+    # Collect properties of the VirtualMachine managed objects
     result = {}
     result['name'] = network_name
-    result['vm'] = agent.collect_properties(
-        view_ref=view_ref,
+    result['vm'] = _collect_object_properties(
+        agent=agent,
+        objects=network_vms,
         obj_type=pyVmomi.vim.VirtualMachine,
         path_set=['name']
     )
 
-    view_ref.DestroyView()
-
     r = {
         'success': 0,
         'msg': 'Successfully discovered objects',
@@ -969,7 +1667,8 @@ def datacenter_perf_metric_get(agent, msg):
         The retrieved performance metrics
 
     """
-    obj = agent.get_object_by_property(
+    obj = _find_object(
+        agent=agent,
         property_name='name',
         property_value=msg['name'],
         obj_type=pyVmomi.vim.Datacenter
@@ -1006,7 +1705,8 @@ def datacenter_perf_metric_info(agent, msg):
         Information about the supported performance counters for the object
 
     """
-    obj = agent.get_object_by_property(
+    obj = _find_object(
+        agent=agent,
         property_name='name',
         property_value=msg['name'],
         obj_type=pyVmomi.vim.Datacenter
@@ -1118,7 +1818,8 @@ def cluster_discover(agent, msg):
     r = _discover_objects(
         agent=agent,
         properties=properties,
-        obj_type=pyVmomi.vim.ClusterComputeResource
+        obj_type=pyVmomi.vim.ClusterComputeResource,
+        datacenter=msg.get('datacenter')
     )
 
     return r
@@ -1146,7 +1847,8 @@ def cluster_perf_metric_get(agent, msg):
         The retrieved performance metrics
 
     """
-    obj = agent.get_object_by_property(
+    obj = _find_object(
+        agent=agent,
         property_name='name',
         property_value=msg['name'],
         obj_type=pyVmomi.vim.ClusterComputeResource
@@ -1183,7 +1885,8 @@ def cluster_perf_metric_info(agent, msg):
         Information about the supported performance counters for the object
 
     """
-    obj = agent.get_object_by_property(
+    obj = _find_object(
+        agent=agent,
         property_name='name',
         property_value=msg['name'],
         obj_type=pyVmomi.vim.ClusterComputeResource
@@ -1295,7 +1998,8 @@ def resource_pool_discover(agent, msg):
     r = _discover_objects(
         agent=agent,
         properties=properties,
-        obj_type=pyVmomi.vim.ResourcePool
+        obj_type=pyVmomi.vim.ResourcePool,
+        datacenter=msg.get('datacenter')
     )
 
     return r
@@ -1384,16 +2088,14 @@ def resource_pool_vm_get(agent, msg):
     props = data['result'][0]
     vms = props['vm']
 
-    # Create a list view for the VirtualMachine managed objects
-    view_ref = agent.get_list_view(obj=vms)
-    result = agent.collect_properties(
-        view_ref=view_ref,
+    # Collect properties of the VirtualMachine managed objects
+    result = _collect_object_properties(
+        agent=agent,
+        objects=vms,
         obj_type=pyVmomi.vim.VirtualMachine,
         path_set=properties,
     )
 
-    view_ref.DestroyView()
-
     # Add the pool name to the properties
     for item in result:
         item['resourcePool.name'] = resource_pool_name
@@ -1441,7 +2143,8 @@ def host_discover(agent, msg):
     r = _discover_objects(
         agent=agent,
         properties=properties,
-        obj_type=pyVmomi.vim.HostSystem
+        obj_type=pyVmomi.vim.HostSystem,
+        datacenter=msg.get('datacenter')
     )
 
     return r
@@ -1480,6 +2183,45 @@ def host_get(agent, msg):
         obj_property_value=msg['name']
     )
 
+
+@task(name='host.batch.get', required=['name', 'properties'])
+def host_batch_get(agent, msg):
+    """
+    Get properties of multiple vim.HostSystem managed objects
+
+    Example client message would be:
+
+    {
+        "method":     "host.batch.get",
+        "hostname":   "vc01.example.org",
+        "name":       ["esxi01.example.org", "esxi02.example.org"],
+        "properties": [
+            "name",
+            "runtime.powerState"
+        ]
+    }
+
+    Returns:
+        The managed objects properties in JSON format
+
+    """
+    names = _get_batch_names(msg)
+    if names['success'] != 0:
+        return names
+
+    properties = ['name']
+    if msg['properties']:
+        properties.extend(msg['properties'])
+
+    return _get_objects_properties(
+        agent=agent,
+        properties=properties,
+        obj_type=pyVmomi.vim.HostSystem,
+        obj_property_name='name',
+        obj_property_values=names['result'],
+        datacenter=msg.get('datacenter')
+    )
+
 @task(name='host.alarm.get', required=['name'])
 def host_alarm_get(agent, msg):
     """
@@ -1526,7 +2268,8 @@ def host_perf_metric_get(agent, msg):
         The retrieved performance metrics
 
     """
-    obj = agent.get_object_by_property(
+    obj = _find_object(
+        agent=agent,
         property_name='name',
         property_value=msg['name'],
         obj_type=pyVmomi.vim.HostSystem
@@ -1580,7 +2323,8 @@ def host_perf_metric_info(agent, msg):
         Information about the supported performance counters for the object
 
     """
-    obj = agent.get_object_by_property(
+    obj = _find_object(
+        agent=agent,
         property_name='name',
         property_value=msg['name'],
         obj_type=pyVmomi.vim.HostSystem
@@ -1685,16 +2429,14 @@ def host_vm_get(agent, msg):
     props = data['result'][0]
     host_vms = props['vm']
 
-    # Create a list view for the VirtualMachine managed objects
-    view_ref = agent.get_list_view(obj=host_vms)
-    result = agent.collect_properties(
-        view_ref=view_ref,
+    # Collect properties of the VirtualMachine managed objects
+    result = _collect_object_properties(
+        agent=agent,
+        objects=host_vms,
         obj_type=pyVmomi.vim.VirtualMachine,
         path_set=['name']
     )
 
-    view_ref.DestroyView()
-
     r = {
         'success': 0,
         'msg': 'Successfully discovered objects',
@@ -1742,18 +2484,16 @@ def host_net_get(agent, msg):
     props = data['result'][0]
     host_name, host_networks = props['name'], props['network']
 
-    # Create a list view for the Network managed objects
-    view_ref = agent.get_list_view(obj=host_networks)
+    # Collect properties of the Network managed objects
     result = {}
     result['name'] = host_name
-    result['network'] = agent.collect_properties(
-        view_ref=view_ref,
+    result['network'] = _collect_object_properties(
+        agent=agent,
+        objects=host_networks,
         obj_type=pyVmomi.vim.Network,
         path_set=['name']
     )
 
-    view_ref.DestroyView()
-
     r = {
         'success': 0,
         'msg': 'Successfully discovered objects',
@@ -1840,7 +2580,8 @@ def vm_perf_metric_get(agent, msg):
         The retrieved performance metrics
 
     """
-    obj = agent.get_object_by_property(
+    obj = _find_object(
+        agent=agent,
         property_name='name',
         property_value=msg['name'],
         obj_type=pyVmomi.vim.VirtualMachine
@@ -1894,7 +2635,8 @@ def vm_perf_metric_info(agent, msg):
         Information about the supported performance counters for the object
 
     """
-    obj = agent.get_object_by_property(
+    obj = _find_object(
+        agent=agent,
         property_name='name',
         property_value=msg['name'],
         obj_type=pyVmomi.vim.VirtualMachine
@@ -1947,11 +2689,29 @@ def vm_discover(agent, msg):
     r = _discover_objects(
         agent=agent,
         properties=properties,
-        obj_type=pyVmomi.vim.VirtualMachine
+        obj_type=pyVmomi.vim.VirtualMachine,
+        datacenter=msg.get('datacenter')
     )
 
     return r
 
+def _guest_disk_properties(msg):
+    """
+    Get the guest disk properties requested by a client message
+
+    Args:
+        msg (dict): The client message
+
+    Returns:
+        A list of guest disk property names
+
+    """
+    properties = ['diskPath']
+    if 'properties' in msg and msg['properties']:
+        properties.extend(msg['properties'])
+
+    return properties
+
 @task(name='vm.disk.discover', required=['name'])
 def vm_disk_discover(agent, msg):
     """
@@ -2010,9 +2770,7 @@ def vm_disk_discover(agent, msg):
     vm_name, vm_disks = props['name'], props['guest.disk']
 
     # Properties to be collected for the guest disks
-    properties = ['diskPath']
-    if 'properties' in msg and msg['properties']:
-        properties.extend(msg['properties'])
+    properties = _guest_disk_properties(msg)
 
     # Get the requested disk properties
     result = {}
@@ -2143,18 +2901,16 @@ def vm_net_get(agent, msg):
     props = data['result'][0]
     vm_name, vm_networks = props['name'], props['network']
 
-    # Create a list view for the Network managed objects
-    view_ref = agent.get_list_view(obj=vm_networks)
+    # Collect properties of the Network managed objects
     result = {}
     result['name'] = vm_name
-    result['network'] = agent.collect_properties(
-        view_ref=view_ref,
+    result['network'] = _collect_object_properties(
+        agent=agent,
+        objects=vm_networks,
         obj_type=pyVmomi.vim.Network,
         path_set=['name']
     )
 
-    view_ref.DestroyView()
-
     r = {
         'success': 0,
         'msg': 'Successfully discovered objects',
@@ -2175,13 +2931,14 @@ def _get_vm_snapshots(agent, name):
         A dict containing the VirtualMachine snaphots
 
     """
-    logger.info(
+    logger.debug(
         '[%s] Getting snapshots for %s VirtualMachine',
         agent.host,
         name
     )
 
-    obj = agent.get_object_by_property(
+    obj = _find_object(
+        agent=agent,
         property_name='name',
         property_value=name,
         obj_type=pyVmomi.vim.VirtualMachine
@@ -2282,6 +3039,45 @@ def vm_get(agent, msg):
         obj_property_value=msg['name']
     )
 
+
+@task(name='vm.batch.get', required=['name', 'properties'])
+def vm_batch_get(agent, msg):
+    """
+    Get properties for multiple vim.VirtualMachine managed objects
+
+    Example client message would be:
+
+        {
+            "method":     "vm.batch.get",
+            "hostname":   "vc01.example.org",
+            "name":       ["vm01.example.org", "vm02.example.org"],
+            "properties": [
+                "name",
+                "runtime.powerState"
+            ]
+        }
+
+    Returns:
+        The managed objects properties in JSON format
+
+    """
+    names = _get_batch_names(msg)
+    if names['success'] != 0:
+        return names
+
+    properties = ['name']
+    if msg['properties']:
+        properties.extend(msg['properties'])
+
+    return _get_objects_properties(
+        agent=agent,
+        properties=properties,
+        obj_type=pyVmomi.vim.VirtualMachine,
+        obj_property_name='name',
+        obj_property_values=names['result'],
+        datacenter=msg.get('datacenter')
+    )
+
 @task(name='vm.host.get', required=['name'])
 def vm_host_get(agent, msg):
     """
@@ -2399,24 +3195,30 @@ def vm_disk_get(agent, msg):
         msg['name']
     )
 
-    # Discover the VM disks
-    data = vm_disk_discover(agent, msg)
-
-    if data['success'] != 0:
-        return data
-
     # If we have no key for the disk,
     # just return the result from discovery
     if 'key' in msg and msg['key']:
         disk_path = msg['key']
     else:
+        return vm_disk_discover(agent, msg)
+
+    # Find the VM and get the guest disks
+    data = _get_object_properties(
+        agent=agent,
+        properties=['name', 'guest.disk'],
+        obj_type=pyVmomi.vim.VirtualMachine,
+        obj_property_name='name',
+        obj_property_value=msg['name']
+    )
+
+    if data['success'] != 0:
         return data
 
     props = data['result'][0]
-    disks = props['disk']
+    disks = props['guest.disk']
 
     for disk in disks:
-        if disk['diskPath'] == disk_path:
+        if disk.diskPath == disk_path:
             break
     else:
         return {
@@ -2424,9 +3226,12 @@ def vm_disk_get(agent, msg):
             'msg': 'Unable to find guest disk %s' % disk_path
         }
 
+    # Get the requested properties only for the matching disk
+    properties = _guest_disk_properties(msg)
+
     result = {}
-    result['name'] = msg['name']
-    result['disk'] = disk
+    result['name'] = props['name']
+    result['disk'] = {prop: getattr(disk, prop, '(null)') for prop in properties}
 
     r = {
         'success': 0,
@@ -2573,17 +3378,9 @@ def vm_cpu_usage_percent(agent, msg):
     # The CPU usage in percentage is directly related to the
     # host the where the Virtual Machine is running on,
     # so we need to collect the 'runtime.host' property as well.
-    required_properties = [
-        'name',
-        'runtime.host',
-        'summary.quickStats.overallCpuUsage',
-        'config.hardware.numCoresPerSocket',
-        'config.hardware.numCPU',
-    ]
-
     data = _get_object_properties(
         agent=agent,
-        properties=required_properties,
+        properties=VM_CPU_USAGE_PROPERTIES,
         obj_type=pyVmomi.vim.VirtualMachine,
         obj_property_name='name',
         obj_property_value=msg['name'],
@@ -2604,7 +3401,26 @@ def vm_cpu_usage_percent(agent, msg):
     #
     #       We should ensure that vPoller Workers do not fail
     #       under such circumstances and return an error message.
-    if not all(p in props for p in required_properties):
+    if not all(p in props for p in VM_CPU_USAGE_PROPERTIES):
+        return {
+            'success': 1,
+            'msg': 'Unable to retrieve required properties'
+        }
+
+    # Get only the CPU speed of the host, instead of accessing
+    # 'hardware.cpuInfo.hz' via the host managed object, which
+    # retrieves the whole 'hardware' property of the host
+    try:
+        host_props = _collect_object_properties(
+            agent=agent,
+            objects=[props['runtime.host']],
+            obj_type=pyVmomi.vim.HostSystem,
+            path_set=['hardware.cpuInfo.hz']
+        )
+    except Exception as e:
+        return {'success': 1, 'msg': 'Cannot collect properties: {}'.format(e)}
+
+    if not host_props or 'hardware.cpuInfo.hz' not in host_props[0]:
         return {
             'success': 1,
             'msg': 'Unable to retrieve required properties'
@@ -2615,7 +3431,7 @@ def vm_cpu_usage_percent(agent, msg):
     # we first convert it back to Hz and then calculate percentage
     cpu_usage = (
         float(props['summary.quickStats.overallCpuUsage'] * 1048576) /
-        (props['runtime.host'].hardware.cpuInfo.hz * props['config.hardware.numCoresPerSocket'] *
+        (host_props[0]['hardware.cpuInfo.hz'] * props['config.hardware.numCoresPerSocket'] *
          props['config.hardware.numCPU']) *
         100
     )
@@ -2669,7 +3485,8 @@ def datastore_discover(agent, msg):
     r = _discover_objects(
         agent=agent,
         properties=properties,
-        obj_type=pyVmomi.vim.Datastore
+        obj_type=pyVmomi.vim.Datastore,
+        datacenter=msg.get('datacenter')
     )
 
     return r
@@ -2709,6 +3526,48 @@ def datastore_get(agent, msg):
         obj_property_value=msg['name']
     )
 
+
+@task(name='datastore.batch.get', required=['name', 'properties'])
+def datastore_batch_get(agent, msg):
+    """
+    Get properties for multiple vim.Datastore managed objects
+
+    Example client message would be:
+
+        {
+            "method":     "datastore.batch.get",
+            "hostname":   "vc01.example.org",
+            "name":       [
+                "ds:///vmfs/volumes/643f118a-a970df28/",
+                "ds:///vmfs/volumes/5190e2a7-d2b7c58e/"
+            ],
+            "properties": [
+                "name",
+                "summary.capacity"
+            ]
+        }
+
+    Returns:
+        The managed objects properties in JSON format
+
+    """
+    names = _get_batch_names(msg)
+    if names['success'] != 0:
+        return names
+
+    properties = ['name']
+    if msg['properties']:
+        properties.extend(msg['properties'])
+
+    return _get_objects_properties(
+        agent=agent,
+        properties=properties,
+        obj_type=pyVmomi.vim.Datastore,
+        obj_property_name='info.url',
+        obj_property_values=names['result'],
+        datacenter=msg.get('datacenter')
+    )
+
 @task(name='datastore.alarm.get', required=['name'])
 def datastore_alarm_get(agent, msg):
     """
@@ -2749,7 +3608,7 @@ def datastore_host_get(agent, msg):
         }
 
     """
-    logger.info(
+    logger.debug(
         '[%s] Getting HostSystem list using Datastore %s',
         agent.host,
         msg['name']
@@ -2776,17 +3635,14 @@ def datastore_host_get(agent, msg):
     # but we need a list of HostSystem ones instead
     obj_host = [h.key for h in obj_host]
 
-    # Get a list view of the hosts from this datastore object
-    # and collect their properties
-    view_ref = agent.get_list_view(obj=obj_host)
-    result = agent.collect_properties(
-        view_ref=view_ref,
+    # Collect properties of the hosts from this datastore object
+    result = _collect_object_properties(
+        agent=agent,
+        objects=obj_host,
         obj_type=pyVmomi.vim.HostSystem,
         path_set=['name']
     )
 
-    view_ref.DestroyView()
-
     r = {
         'success': 0,
         'msg': 'Successfully discovered objects',
@@ -2809,7 +3665,7 @@ def datastore_vm_get(agent, msg):
         }
 
     """
-    logger.info(
+    logger.debug(
         '[%s] Getting VirtualMachine list using Datastore %s',
         agent.host,
         msg['name']
@@ -2832,17 +3688,14 @@ def datastore_vm_get(agent, msg):
     props = data['result'][0]
     obj_vm = props['vm']
 
-    # Get a list view of the VMs from this datastore object
-    # and collect their properties
-    view_ref = agent.get_list_view(obj=obj_vm)
-    result = agent.collect_properties(
-        view_ref=view_ref,
+    # Collect properties of the VMs from this datastore object
+    result = _collect_object_properties(
+        agent=agent,
+        objects=obj_vm,
         obj_type=pyVmomi.vim.VirtualMachine,
         path_set=['name']
     )
 
-    view_ref.DestroyView()
-
     r = {
         'success': 0,
         'msg': 'Successfully discovered objects',
@@ -2869,7 +3722,8 @@ def datastore_perf_metric_info(agent, msg):
         Information about the supported performance counters for the object
 
     """
-    obj = agent.get_object_by_property(
+    obj = _find_object(
+        agent=agent,
         property_name='info.url',
         property_value=msg['name'],
         obj_type=pyVmomi.vim.Datastore
@@ -2918,7 +3772,8 @@ def datastore_perf_metric_get(agent, msg):
         The retrieved performance metrics
 
     """
-    obj = agent.get_object_by_property(
+    obj = _find_object(
+        agent=agent,
         property_name='info.url',
         property_value=msg['name'],
         obj_type=pyVmomi.vim.Datastore
@@ -2965,21 +3820,15 @@ def vsan_health_get(agent, msg):
         VSAN health state for the host
 
     """
-    logger.info(
+    logger.debug(
         '[%s] Retrieving VSAN health state for %s',
         agent.host,
         msg['name'],
     )
 
-    properties = [
-        'name',
-        'runtime.powerState',
-        'runtime.connectionState'
-    ]
-
     data = _get_object_properties(
         agent=agent,
-        properties=properties,
+        properties=HOST_VSAN_HEALTH_PROPERTIES,
         obj_type=pyVmomi.vim.HostSystem,
         obj_property_name='name',
         obj_property_value=msg['name'],
@@ -28,21 +28,23 @@ vPoller Worker module
 """
 
 import json
+import time
 import importlib
+import threading
 import multiprocessing
 
-from platform import node
-
-try:
-    from ConfigParser import ConfigParser
-except ImportError:
-    from configparser import ConfigParser
+from multiprocessing.pool import ThreadPool
 
 import zmq
 import pyVmomi
 
 from vpoller import __version__
+from vpoller import codec
 from vpoller.log import logger
+from vpoller.manager import VPollerManager
+from vpoller.cache import TTLCache
+from vpoller.codec import DefaultJSONEncoder
+from vpoller.throttle import Throttle
 from vpoller.client import validate_message
 from vpoller.exceptions import VPollerException
 from vpoller.task.registry import registry
@@ -51,27 +53,24 @@ from vconnector.core import VConnectorDatabase
 
 __all__ = ['VPollerWorkerManager', 'VPollerWorker', 'DefaultJSONEncoder']
 
-class DefaultJSONEncoder(json.JSONEncoder):
-    """
-    DefaultJSONEncoder is a custom JSONEncoder class that knows how to
-    encode core custom objects.
-
-    Until pyVmomi supports encoding of core objects to JSON we cannot
-    marshal arbitrary objects on the fly, thus the need for this class.
+# Maximum number of messages received from a socket at once,
+# before polling the sockets of the vPoller Worker again
+MAX_MESSAGES_PER_POLL = 256
 
-    See https://github.com/vmware/pyvmomi/issues/21 for more info.
-    """
-    def default(self, obj):
-        try:
-            return super(DefaultJSONEncoder, self).default(obj)
-        except Exception:
-            return obj.__dict__
+# Maximum number of vSphere Agents connected or
+# disconnected concurrently by a vPoller Worker
+MAX_AGENT_THREADS = 16
 
-class VPollerWorkerManager(object):
+class VPollerWorkerManager(VPollerManager):
     """
     Manager of vPoller Workers
 
+    Extends:
+        VPollerManager
+
     """
+    name = 'Worker Manager'
+
     def __init__(self, config_file, num_workers=0):
         """
         Initializes a new vPoller Worker Manager
@@ -82,29 +81,29 @@ class VPollerWorkerManager(object):
                                processes to create
 
         """
-        self.node = node()
-        self.config_file = config_file
+        super(VPollerWorkerManager, self).__init__(config_file)
         self.num_workers = num_workers
-        self.time_to_die = multiprocessing.Event()
-        self.config = {}
         self.workers = []
-        self.zcontext = None
-        self.zpoller = None
-        self.mgmt_socket = None
-        self.mgmt_methods = {
-            'status': self.status,
-            'shutdown': self.signal_stop,
-        }
+        self.mgmt_methods['cache.flush'] = self.flush_cache
         self.config_defaults = {
             'db': '/var/lib/vconnector/vconnector.db',
             'mgmt': 'tcp://*:10000',
             'proxy': 'tcp://localhost:10123',
             'helpers': 'None',
             'tasks': 'None',
+            'max_rps': '0',
+            'slow_request': '5',
+            'keepalive': '600',
+            'threads': '0',
+            'agent_limit': '0',
+            'hwm': '1000',
             'cache_maxsize': '0',
             'cache_enabled': 'False',
             'cache_ttl': '3600',
             'cache_housekeeping': '480',
+            'result_ttl': '0',
+            'result_size': '0',
+            'discover_ttl': '0',
         }
 
     def start(self):
@@ -136,35 +135,31 @@ class VPollerWorkerManager(object):
         self.close_sockets()
         self.stop_workers()
 
-    def signal_stop(self):
-        """
-        Signal the vPoller Worker Manager that shutdown time has arrived
-
-        """
-        logger.info('Received shutdown signal')
-        self.time_to_die.set()
-
-        return {'success': 0, 'msg': 'Shutdown time has arrived'}
-
     def load_config(self):
         """
         Loads the vPoller Worker Manager configuration settings
 
         """
-        logger.debug('Loading config file %s', self.config_file)
-
-        parser = ConfigParser(self.config_defaults)
-        parser.read(self.config_file)
+        parser = self.read_config()
 
         self.config['mgmt'] = parser.get('worker', 'mgmt')
         self.config['db'] = parser.get('worker', 'db')
         self.config['proxy'] = parser.get('worker', 'proxy')
         self.config['helpers'] = parser.get('worker', 'helpers')
         self.config['tasks'] = parser.get('worker', 'tasks')
+        self.config['max_rps'] = parser.getfloat('worker', 'max_rps')
+        self.config['slow_request'] = parser.getfloat('worker', 'slow_request')
+        self.config['keepalive'] = parser.getint('worker', 'keepalive')
+        self.config['threads'] = parser.getint('worker', 'threads')
+        self.config['agent_limit'] = parser.getint('worker', 'agent_limit')
+        self.config['hwm'] = parser.getint('worker', 'hwm')
         self.config['cache_enabled'] = parser.getboolean('cache', 'enabled')
         self.config['cache_maxsize'] = parser.getint('cache', 'maxsize')
         self.config['cache_ttl'] = parser.getint('cache', 'ttl')
         self.config['cache_housekeeping'] = parser.getint('cache', 'housekeeping')
+        self.config['cache_result_ttl'] = parser.getint('cache', 'result_ttl')
+        self.config['cache_result_size'] = parser.getint('cache', 'result_size')
+        self.config['cache_discover_ttl'] = parser.getint('cache', 'discover_ttl')
 
         if self.config['helpers']:
             self.config['helpers'] = self.config['helpers'].split(',')
@@ -192,6 +187,10 @@ class VPollerWorkerManager(object):
             self.num_workers
         )
 
+        # The vSphere Agents are read from the vConnector
+        # database once and shared with all Worker processes
+        agents = self.load_agents()
+
         for i in range(self.num_workers):
             worker = VPollerWorker(
                 db=self.config.get('db'),
@@ -201,92 +200,62 @@ class VPollerWorkerManager(object):
                 cache_enabled=self.config.get('cache_enabled'),
                 cache_maxsize=self.config.get('cache_maxsize'),
                 cache_ttl=self.config.get('cache_ttl'),
-                cache_housekeeping=self.config.get('cache_housekeeping')
+                cache_housekeeping=self.config.get('cache_housekeeping'),
+                cache_result_ttl=self.config.get('cache_result_ttl'),
+                cache_result_size=self.config.get('cache_result_size'),
+                cache_discover_ttl=self.config.get('cache_discover_ttl'),
+                max_rps=self.config.get('max_rps'),
+                slow_request=self.config.get('slow_request'),
+                keepalive=self.config.get('keepalive'),
+                threads=self.config.get('threads'),
+                agent_limit=self.config.get('agent_limit'),
+                hwm=self.config.get('hwm'),
+                agents=agents
             )
             worker.daemon = True
             self.workers.append(worker)
             worker.start()
 
-    def stop_workers(self):
+    def load_agents(self):
         """
-        Stop the vPoller Worker processes
-
-        """
-        logger.info('Stopping Worker processes')
+        Loads the registered and enabled vSphere Agents
 
-        for worker in self.workers:
-            worker.signal_stop()
-            worker.join(3)
-
-    def create_sockets(self):
-        """
-        Creates the ZeroMQ sockets used by the vPoller Worker Manager
+        Returns:
+            A list of dicts with the vSphere Agent settings
 
         """
-        logger.debug('Creating Worker Manager sockets')
+        logger.debug('Loading vSphere Agents from %s', self.config.get('db'))
 
-        self.zcontext = zmq.Context()
-        self.mgmt_socket = self.zcontext.socket(zmq.REP)
-        self.mgmt_socket.bind(self.config.get('mgmt'))
-        self.zpoller = zmq.Poller()
-        self.zpoller.register(self.mgmt_socket, zmq.POLLIN)
+        db = VConnectorDatabase(self.config.get('db'))
 
-    def close_sockets(self):
-        """
-        Closes the ZeroMQ sockets used by the Manager
+        return [dict(agent) for agent in db.get_agents(only_enabled=True)]
 
+    def stop_workers(self):
         """
-        logger.debug('Closing Worker Manager sockets')
-
-        self.zpoller.unregister(self.mgmt_socket)
-        self.mgmt_socket.close()
-        self.zcontext.term()
+        Stop the vPoller Worker processes
 
-    def wait_for_mgmt_task(self):
         """
-        Poll the management socket for management tasks
+        logger.info('Stopping Worker processes')
 
-        """
-        socks = dict(self.zpoller.poll())
-        if socks.get(self.mgmt_socket) == zmq.POLLIN:
-            try:
-                msg = self.mgmt_socket.recv_json()
-            except TypeError:
-                logger.warning(
-                    'Invalid message received on management interface',
-                )
-                self.mgmt_socket.send('Invalid message received')
-                return
+        # Signal all workers first, so that they shut down in parallel
+        for worker in self.workers:
+            worker.signal_stop()
 
-            result = self.process_mgmt_task(msg)
-            self.mgmt_socket.send_json(result)
+        deadline = time.time() + 3
+        for worker in self.workers:
+            worker.join(max(deadline - time.time(), 0))
 
-    def process_mgmt_task(self, msg):
+    def flush_cache(self):
         """
-        Processes a message for the management interface
-
-        Example client message to shutdown the vPoller Worker would be:
-
-            {
-                "method": "shutdown"
-            }
-
-        Args:
-            msg (dict): The client message for processing
+        Flush the cached task results of the vPoller Worker processes
 
         """
-        logger.debug('Processing management message: %s', msg)
-
-        if 'method' not in msg:
-            return {'success': 1, 'msg': 'Missing method name'}
+        logger.info('Flushing the cached task results of Worker processes')
 
-        if msg['method'] not in self.mgmt_methods:
-            return {'success': 1, 'msg': 'Unknown method name received'}
+        for worker in self.workers:
+            worker.signal_flush_cache()
 
-        method = msg['method']
-        result = self.mgmt_methods[method]()
-
-        return result
+        return {'success': 0, 'msg': 'Cache flush has been requested'}
 
     def status(self):
         """
@@ -295,20 +264,15 @@ class VPollerWorkerManager(object):
         """
         logger.debug('Getting Worker status')
 
-        result = {
-            'success': 0,
-            'msg': 'vPoller Worker status',
-            'result': {
-                'status': 'running',
-                'hostname': self.node,
-                'proxy': self.config.get('proxy'),
-                'mgmt': self.config.get('mgmt'),
-                'db': self.config.get('db'),
-                'concurrency': self.num_workers,
-                'helpers': self.config.get('helpers'),
-                'tasks': self.config.get('tasks'),
-            }
-        }
+        result = super(VPollerWorkerManager, self).status()
+        result['msg'] = 'vPoller Worker status'
+        result['result'].update({
+            'proxy': self.config.get('proxy'),
+            'db': self.config.get('db'),
+            'concurrency': self.num_workers,
+            'helpers': self.config.get('helpers'),
+            'tasks': self.config.get('tasks'),
+        })
 
         logger.debug('Returning result to client: %s', result)
 
@@ -338,6 +302,16 @@ class VPollerWorker(multiprocessing.Process):
                  cache_maxsize,
                  cache_ttl,
                  cache_housekeeping,
+                 cache_result_ttl=0,
+                 cache_result_size=0,
+                 cache_discover_ttl=0,
+                 max_rps=0,
+                 slow_request=5,
+                 keepalive=600,
+                 threads=0,
+                 agent_limit=0,
+                 hwm=1000,
+                 agents=None,
     ):
         """
         Initialize a new VPollerWorker object
@@ -356,6 +330,34 @@ class VPollerWorker(multiprocessing.Process):
                                       object is considered as expired
             cache_housekeeping (int): Time in minutes to perform
                                       periodic housekeeping of the cache
+            cache_result_ttl   (int): Time in seconds for which the results
+                                      of tasks are cached, zero disables
+                                      the caching of results
+            cache_result_size  (int): Upperbound limit on the number of
+                                      cached results, zero means no limit
+            cache_discover_ttl (int): Time in seconds for which the results
+                                      of discovery tasks are cached, zero
+                                      means that cache_result_ttl is used
+            max_rps          (float): Maximum number of requests per second
+                                      sent to a vSphere host, zero disables
+                                      the throttling of requests
+            slow_request     (float): Time in seconds after which a request
+                                      is considered as slow and the rate of
+                                      requests is reduced
+            keepalive          (int): Time in seconds between checks that the
+                                      vSphere sessions are still alive, zero
+                                      disables the checks
+            threads            (int): Number of threads used for processing
+                                      tasks concurrently, zero means that
+                                      tasks are processed one at a time
+            agent_limit        (int): Maximum number of tasks processed
+                                      concurrently for a single vSphere host,
+                                      zero means no limit
+            hwm                (int): High water mark of the socket connected
+                                      to the vPoller Proxy
+            agents            (list): Settings of the vSphere Agents, if not
+                                      specified they are loaded from the
+                                      vConnector database
 
         """
         super(VPollerWorker, self).__init__()
@@ -368,14 +370,38 @@ class VPollerWorker(multiprocessing.Process):
             'cache_maxsize': cache_maxsize,
             'cache_ttl': cache_ttl,
             'cache_housekeeping': cache_housekeeping,
+            'cache_result_ttl': cache_result_ttl,
+            'cache_result_size': cache_result_size,
+            'cache_discover_ttl': cache_discover_ttl,
+            'max_rps': max_rps,
+            'slow_request': slow_request,
+            'keepalive': keepalive,
+            'threads': threads,
+            'agent_limit': agent_limit,
+            'hwm': hwm,
+            'agents': agents,
         }
         self.task_modules = {}
         self.helper_modules = {}
         self.time_to_die = multiprocessing.Event()
+        self.time_to_flush = multiprocessing.Event()
         self.agents = {}
+        self.result_cache = None
+        self.throttles = {}
+        self.semaphores = {}
+        self.connect_locks = {}
+        self.keepalive_thread = None
+        self.pool = None
+        self.inflight = {}
+        self.inflight_lock = threading.Lock()
+        self.thread_data = threading.local()
+        self.thread_sockets = []
+        self.thread_sockets_lock = threading.Lock()
         self.zcontext = None
         self.zpoller = None
         self.worker_socket = None
+        self.result_socket = None
+        self.result_endpoint = 'inproc://vpoller-worker-results'
 
     def run(self):
         """
@@ -391,6 +417,10 @@ class VPollerWorker(multiprocessing.Process):
         self.load_helper_modules()
         self.create_sockets()
         self.create_agents()
+        self.start_agents()
+        self.create_result_cache()
+        self.create_thread_pool()
+        self.start_keepalive()
 
         logger.info('Worker process is ready and running')
         while not self.time_to_die.is_set():
@@ -399,6 +429,9 @@ class VPollerWorker(multiprocessing.Process):
             except KeyboardInterrupt:
                 self.signal_stop()
 
+            if self.time_to_flush.is_set():
+                self.flush_cache()
+
         self.stop()
 
     def stop(self):
@@ -407,8 +440,15 @@ class VPollerWorker(multiprocessing.Process):
 
         """
         logger.info('Worker process is shutting down')
-        self.close_sockets()
+
+        # The Worker Manager waits 3 seconds for the worker process,
+        # so leave time for logging out the vSphere Agents, even if
+        # tasks are still blocked on an unreachable vSphere host
+        deadline = time.time() + 2
+        self.stop_keepalive(max(deadline - time.time(), 0))
+        self.stop_thread_pool(max(deadline - time.time(), 0))
         self.stop_agents()
+        self.close_sockets()
 
     def signal_stop(self):
         """
@@ -417,6 +457,24 @@ class VPollerWorker(multiprocessing.Process):
         """
         self.time_to_die.set()
 
+    def signal_flush_cache(self):
+        """
+        Signal the vPoller Worker process to flush the cached task results
+
+        """
+        self.time_to_flush.set()
+
+    def flush_cache(self):
+        """
+        Flush the cached task results
+
+        """
+        self.time_to_flush.clear()
+
+        if self.result_cache is not None:
+            logger.info('Flushing cached task results')
+            self.result_cache.clear()
+
     def load_task_modules(self):
         """
         Loads the task modules
@@ -433,7 +491,7 @@ class VPollerWorker(multiprocessing.Process):
             except ImportError as e:
                 logger.warning(
                     'Cannot import task module: %s',
-                    e.message
+                    e
                 )
                 continue
             self.task_modules[task] = module
@@ -508,89 +566,338 @@ class VPollerWorker(multiprocessing.Process):
         Poll the worker socket for new tasks
 
         """
-        socks = dict(self.zpoller.poll(1000))
+        # Only POLLIN is registered, so any returned socket is readable
+        for socket, _ in self.zpoller.poll(1000):
+            if socket is self.worker_socket:
+                self.receive_tasks()
+            else:
+                # Forward results of tasks processed by the thread pool
+                self.forward_results()
+
+    def forward_results(self):
+        """
+        Forwards the results of the thread pool to the vPoller Proxy
+
+        All results which are ready are forwarded at once,
+        up to MAX_MESSAGES_PER_POLL results. The frames are
+        forwarded as they are, without copying them into bytes.
+
+        """
+        for _ in range(MAX_MESSAGES_PER_POLL):
+            try:
+                frames = self.result_socket.recv_multipart(zmq.NOBLOCK, copy=False)
+            except zmq.Again:
+                break
+            self.worker_socket.send_multipart(frames, copy=False)
+
+    def receive_tasks(self):
+        """
+        Receives the tasks waiting on the worker socket
+
+        All tasks which are waiting are received at once, up to
+        MAX_MESSAGES_PER_POLL tasks, so that each task does not
+        require another poll of the sockets.
 
+        """
         # The routing envelope of the message on the worker socket is this:
         #
         # Frame 1: [ N ][...]  <- Identity of connection
-        # Frame 2: [ 0 ][]     <- Empty delimiter frame
-        # Frame 3: [ N ][...]  <- Data frame
-        if socks.get(self.worker_socket) == zmq.POLLIN:
-            # TODO: Use recv_multipart()
-            _id = self.worker_socket.recv()
-            _empty = self.worker_socket.recv()
+        # Frame 2: [ 4 ][...]  <- Request id (only if REQ_CORRELATE is set)
+        # Frame 3: [ 0 ][]     <- Empty delimiter frame
+        # Frame 4: [ N ][...]  <- Data frame
+        #
+        # The envelope is sent back unchanged together with the result.
+        for _ in range(MAX_MESSAGES_PER_POLL):
+            if self.time_to_die.is_set():
+                break
 
             try:
-                msg = self.worker_socket.recv_json()
-            except Exception as e:
+                frames = self.worker_socket.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+
+            if len(frames) < 3 or frames[-2]:
+                logger.warning('Invalid message envelope received, will be ignored')
+                continue
+
+            envelope = frames[:-1]
+            data = frames[-1]
+
+            try:
+                msg = codec.loads(data)
+            except ValueError:
                 logger.warning(
                     'Invalid client message received, will be ignored',
                 )
-                self.worker_socket.send(_id, zmq.SNDMORE)
-                self.worker_socket.send(_empty, zmq.SNDMORE)
-                self.worker_socket.send_json(
-                    {'success': 1, 'msg': 'Invalid message received'}
+                r = {'success': 1, 'msg': 'Invalid message received'}
+                self.worker_socket.send_multipart(
+                    envelope + [codec.dumps(r)]
                 )
-                return
-
-            # Process task and return result to client
-            result = self.process_client_msg(msg)
+                continue
 
-            # Process data using a helper before sending it to client?
-            if 'helper' in msg and msg['helper'] in self.helper_modules:
-                data = self.run_helper(
-                    helper=msg['helper'],
-                    msg=msg,
-                    data=result
-                )
+            if self.pool is None:
+                data = self.process_task(msg)
+                self.worker_socket.send_multipart(envelope + [data], copy=False)
             else:
-                # No helper specified, dump data to JSON
-                try:
-                    data = json.dumps(result, cls=DefaultJSONEncoder, ensure_ascii=False)
-                except (ValueError, TypeError) as e:
-                    logger.warning('Cannot serialize result: %s', e)
-                    r = {
-                        'success': 1,
-                        'msg': 'Cannot serialize result: %s' % e
-                    }
-                    data = json.dumps(r)
-
-            # Send data to client
-            self.worker_socket.send(_id, zmq.SNDMORE)
-            self.worker_socket.send(_empty, zmq.SNDMORE)
+                self.submit_task(envelope, msg)
+
+    def submit_task(self, envelope, msg):
+        """
+        Submits a task for processing by the thread pool
+
+        Identical task requests may arrive while the first one is
+        still being processed. Instead of sending the same requests
+        to the vSphere host again, they are queued for the result of
+        the task which is already in progress. The queued requests do
+        not take up a thread of the thread pool while waiting.
+
+        Args:
+            envelope (list): Routing envelope of the client message
+            msg      (dict): Client message for processing
+
+        """
+        key = self.get_task_key(msg)
+        if key is not None:
+            with self.inflight_lock:
+                waiting = self.inflight.get(key)
+                if waiting is not None:
+                    logger.debug('Queuing task for the result of the identical task in progress')
+                    waiting.append((envelope, msg))
+                    return
+                self.inflight[key] = []
+
+        self.pool.apply_async(self.process_task_async, (envelope, msg, key))
+
+    def get_task_key(self, msg):
+        """
+        Get the key identifying identical task requests
+
+        Helpers only post-process the result, so they
+        are not part of the key.
+
+        Args:
+            msg (dict): Client message for processing
+
+        Returns:
+            The key of the task request, or None if the message is invalid
+
+        """
+        if not isinstance(msg, dict):
+            return None
+
+        return json.dumps(
+            {k: v for k, v in msg.items() if k != 'helper'},
+            sort_keys=True
+        )
+
+    def process_task(self, msg):
+        """
+        Processes a task and prepares the result for sending to the client
+
+        Results are always sent to the client as UTF-8 encoded JSON,
+        or as the output of the requested helper module.
+
+        Args:
+            msg (dict): Client message for processing
+
+        Returns:
+            The result data to be sent to the client as bytes
+
+        """
+        # Process task and return result to client
+        result = self.process_client_msg(msg)
+
+        return self.encode_result(msg, result)
+
+    def encode_result(self, msg, result):
+        """
+        Prepares the result of a task for sending to the client
+
+        Args:
+            msg    (dict): Client message of the task
+            result (dict): Result of the task
+
+        Returns:
+            The result data to be sent to the client as bytes
+
+        """
+        # Process data using a helper before sending it to client?
+        if 'helper' in msg and msg['helper'] in self.helper_modules:
+            data = self.run_helper(
+                helper=msg['helper'],
+                msg=msg,
+                data=result
+            )
+        else:
+            # No helper specified, dump data to JSON
             try:
-                self.worker_socket.send_unicode(data)
-            except TypeError as e:
-                logger.warning('Cannot send result: %s', e)
-                r = {'success': 1, 'msg': 'Cannot send result: %s' % e}
-                self.worker_socket.send_unicode(json.dumps(r))
+                data = codec.dumps(result)
+            except (ValueError, TypeError) as e:
+                logger.warning('Cannot serialize result: %s', e)
+                r = {
+                    'success': 1,
+                    'msg': 'Cannot serialize result: %s' % e
+                }
+                data = codec.dumps(r)
+
+        if isinstance(data, bytes):
+            return data
+
+        try:
+            return data.encode('utf-8')
+        except AttributeError as e:
+            logger.warning('Cannot send result: %s', e)
+            r = {'success': 1, 'msg': 'Cannot send result: %s' % e}
+            return codec.dumps(r)
+
+    def process_task_async(self, envelope, msg, key=None):
+        """
+        Processes a task in a thread of the thread pool
+
+        The result is sent to the main thread of the vPoller Worker,
+        which forwards it to the client, as ZeroMQ sockets
+        cannot be shared between threads. The result is also sent
+        for the identical task requests queued while the task was
+        in progress.
+
+        Args:
+            envelope (list): Routing envelope of the client message
+            msg      (dict): Client message for processing
+            key       (str): Key identifying identical task requests,
+                             None if the task is not shared
+
+        """
+        # Tasks still queued at shutdown are dropped, as their
+        # results would not be forwarded anymore. Clients retry them.
+        result = None
+        if not self.time_to_die.is_set():
+            try:
+                result = self.process_client_msg(msg)
+            except Exception as e:
+                logger.warning('Cannot process task: %s', e)
+                result = {'success': 1, 'msg': 'Cannot process task: %s' % e}
+
+        requests = [(envelope, msg)]
+        if key is not None:
+            with self.inflight_lock:
+                requests.extend(self.inflight.pop(key))
+
+        if result is None:
+            return
+
+        socket = getattr(self.thread_data, 'socket', None)
+        if socket is None:
+            with self.thread_sockets_lock:
+                # Tasks abandoned at shutdown must not create sockets,
+                # which would keep the ZeroMQ context from terminating
+                if self.time_to_die.is_set():
+                    return
+                socket = self.zcontext.socket(zmq.PUSH)
+                socket.setsockopt(zmq.LINGER, 0)
+                socket.connect(self.result_endpoint)
+                self.thread_data.socket = socket
+                self.thread_sockets.append(socket)
+
+        for envelope, msg in requests:
+            try:
+                data = self.encode_result(msg, result)
+            except Exception as e:
+                logger.warning('Cannot process task: %s', e)
+                r = {'success': 1, 'msg': 'Cannot process task: %s' % e}
+                data = codec.dumps(r)
+            socket.send_multipart(envelope + [data], copy=False)
 
     def create_sockets(self):
         """
         Creates the ZeroMQ sockets used by the vPoller Worker
 
-        Creates two sockets:
+        Creates the worker socket connected to the vPoller Proxy and
+        if a thread pool is used for processing tasks, the socket
+        on which the results from the thread pool are received.
 
         """
         logger.info('Creating Worker sockets')
 
         self.zcontext = zmq.Context()
         self.worker_socket = self.zcontext.socket(zmq.DEALER)
+        self.worker_socket.setsockopt(zmq.SNDHWM, self.config.get('hwm'))
+        self.worker_socket.setsockopt(zmq.RCVHWM, self.config.get('hwm'))
+        self.worker_socket.setsockopt(zmq.TCP_KEEPALIVE, 1)
+        self.worker_socket.setsockopt(zmq.LINGER, 0)
         self.worker_socket.connect(self.config.get('proxy'))
         self.zpoller = zmq.Poller()
         self.zpoller.register(self.worker_socket, zmq.POLLIN)
 
+        if self.config.get('threads') > 0:
+            self.result_socket = self.zcontext.socket(zmq.PULL)
+            self.result_socket.bind(self.result_endpoint)
+            self.zpoller.register(self.result_socket, zmq.POLLIN)
+
     def close_sockets(self):
         """
         Closes the ZeroMQ sockets used by the vPoller Worker
 
         """
         logger.info('Closing Worker process sockets')
-        
+
+        with self.thread_sockets_lock:
+            for socket in self.thread_sockets:
+                socket.close()
+
+        if self.result_socket is not None:
+            self.zpoller.unregister(self.result_socket)
+            self.result_socket.close()
+
         self.zpoller.unregister(self.worker_socket)
         self.worker_socket.close()
         self.zcontext.term()
 
+    def create_thread_pool(self):
+        """
+        Creates the thread pool used for processing tasks concurrently
+
+        The threads share the vSphere sessions of the vPoller Worker,
+        so tasks waiting on a vSphere host do not block other tasks.
+
+        """
+        threads = self.config.get('threads')
+        if not threads or threads <= 0:
+            return
+
+        logger.info('Processing tasks using %d threads', threads)
+        self.pool = ThreadPool(processes=threads)
+
+    def stop_thread_pool(self, timeout):
+        """
+        Waits for the tasks being processed by the thread pool
+
+        Tasks which have not been started yet are skipped, so only
+        the tasks already in progress are waited for. Tasks still
+        in progress after the timeout are abandoned, as they may be
+        blocked on an unreachable vSphere host.
+
+        Args:
+            timeout (float): Time in seconds to wait for the tasks
+
+        """
+        if self.pool is None:
+            return
+
+        self.pool.close()
+
+        # ThreadPool.join() cannot time out, so wait on it in a thread
+        t = threading.Thread(target=self.pool.join)
+        t.daemon = True
+        t.start()
+        t.join(timeout)
+
+        if t.is_alive():
+            logger.warning(
+                'Tasks still in progress after %.1f seconds, terminating thread pool',
+                timeout
+            )
+            self.pool.terminate()
+
     def create_agents(self):
         """
         Prepares the vSphere Agents used by the vPoller Worker
@@ -601,8 +908,10 @@ class VPollerWorker(multiprocessing.Process):
         """
         logger.debug('Creating vSphere Agents')
 
-        db = VConnectorDatabase(self.config.get('db'))
-        agents = db.get_agents(only_enabled=True)
+        agents = self.config.get('agents')
+        if agents is None:
+            db = VConnectorDatabase(self.config.get('db'))
+            agents = db.get_agents(only_enabled=True)
 
         if not agents:
             logger.warning('No registered or enabled vSphere Agents found')
@@ -621,8 +930,181 @@ class VPollerWorker(multiprocessing.Process):
                 cache_housekeeping=self.config.get('cache_housekeeping')
             )
             self.agents[a.host] = a
+            self.connect_locks[a.host] = threading.Lock()
             logger.info('Created vSphere Agent for %s', agent['host'])
 
+            if self.config.get('agent_limit') > 0:
+                self.semaphores[a.host] = threading.BoundedSemaphore(
+                    self.config.get('agent_limit')
+                )
+
+            if self.config.get('max_rps') > 0:
+                self.throttles[a.host] = Throttle(
+                    name=a.host,
+                    max_rps=self.config.get('max_rps'),
+                    slow_request=self.config.get('slow_request')
+                )
+
+    def create_result_cache(self):
+        """
+        Creates the cache used for storing results of tasks
+
+        Results of tasks are cached for a short period of time, so
+        that repeated requests for the same data within that period
+        are served without making any vSphere API requests.
+
+        """
+        ttl = self.config.get('cache_result_ttl') or 0
+        discover_ttl = self.config.get('cache_discover_ttl') or 0
+        if ttl <= 0 and discover_ttl <= 0:
+            return
+
+        logger.info(
+            'Caching task results for %d seconds, discovery results for %d seconds',
+            ttl,
+            discover_ttl if discover_ttl > 0 else ttl
+        )
+        self.result_cache = TTLCache(
+            ttl=ttl,
+            maxsize=self.config.get('cache_result_size') or 0
+        )
+
+    def start_agents(self):
+        """
+        Establishes the sessions of all vSphere Agents
+
+        The sessions are established once when the vPoller Worker
+        starts and are kept open during the lifetime of the worker,
+        so that client requests do not pay for a vSphere login.
+
+        """
+        logger.debug('Starting vSphere Agents')
+
+        self.map_agents(self.connect_agent)
+
+    def map_agents(self, func):
+        """
+        Applies a function to all vSphere Agents concurrently
+
+        Logging in and out of vSphere hosts is dominated by the
+        network round-trips, so the vSphere Agents are handled
+        concurrently, instead of one vSphere host at a time.
+
+        Args:
+            func (callable): The function to apply to each vSphere Agent
+
+        """
+        agents = list(self.agents.values())
+        if len(agents) < 2:
+            for agent in agents:
+                func(agent)
+            return
+
+        pool = ThreadPool(processes=min(len(agents), MAX_AGENT_THREADS))
+        try:
+            pool.map(func, agents)
+        finally:
+            pool.close()
+            pool.join()
+
+    def connect_agent(self, agent):
+        """
+        Establishes the session of a vSphere Agent
+
+        If the vSphere Agent is already being connected by another
+        thread, waits for it to finish instead of logging in again.
+
+        Args:
+            agent (VConnector): The vSphere Agent to connect
+
+        """
+        lock = self.connect_locks[agent.host]
+        if not lock.acquire(False):
+            with lock:
+                return
+
+        try:
+            agent.connect()
+        except Exception as e:
+            logger.warning(
+                'Cannot connect to %s: %s',
+                agent.host,
+                e
+            )
+        finally:
+            lock.release()
+
+    def start_keepalive(self):
+        """
+        Starts the thread which keeps the vSphere sessions alive
+
+        The sessions are checked in a separate thread, so that an
+        unreachable vSphere host does not block the processing of
+        tasks for the other vSphere hosts.
+
+        """
+        interval = self.config.get('keepalive')
+        if not interval or interval <= 0:
+            return
+
+        self.keepalive_thread = threading.Thread(
+            target=self.keep_agents_alive,
+            args=(interval,)
+        )
+        self.keepalive_thread.daemon = True
+        self.keepalive_thread.start()
+
+    def stop_keepalive(self, timeout):
+        """
+        Waits for the thread which keeps the vSphere sessions alive
+
+        A check in progress may be blocked on an unreachable vSphere
+        host, so the thread is waited for a limited time only.
+
+        Args:
+            timeout (float): Time in seconds to wait for the thread
+
+        """
+        if self.keepalive_thread is None:
+            return
+
+        self.keepalive_thread.join(timeout)
+
+    def keep_agents_alive(self, interval):
+        """
+        Makes sure that the sessions of the vSphere Agents are alive
+
+        vSphere sessions expire after a period of inactivity, so
+        periodically make a cheap request using each session and
+        reconnect the agents whose session is no longer valid.
+
+        Runs until the vPoller Worker is signaled to shut down.
+
+        Args:
+            interval (int): Time in seconds between checks of the sessions
+
+        """
+        while not self.time_to_die.wait(interval):
+            self.map_agents(self.keep_agent_alive)
+
+    def keep_agent_alive(self, agent):
+        """
+        Reconnects a vSphere Agent if its session is no longer alive
+
+        Args:
+            agent (VConnector): The vSphere Agent to check
+
+        """
+        try:
+            agent.si.CurrentTime()
+        except Exception as e:
+            logger.warning(
+                'Session to %s is not alive, reconnecting: %s',
+                agent.host,
+                e
+            )
+            self.connect_agent(agent)
+
     def stop_agents(self):
         """
         Disconnects all vPoller Agents
@@ -630,8 +1112,28 @@ class VPollerWorker(multiprocessing.Process):
         """
         logger.debug('Shutting down vSphere Agents')
 
-        for agent in self.agents:
-            self.agents[agent].disconnect()
+        # Cached results are not valid across vSphere sessions
+        if self.result_cache is not None:
+            self.result_cache.clear()
+
+        self.map_agents(self.disconnect_agent)
+
+    def disconnect_agent(self, agent):
+        """
+        Closes the session of a vSphere Agent
+
+        Args:
+            agent (VConnector): The vSphere Agent to disconnect
+
+        """
+        try:
+            agent.disconnect()
+        except Exception as e:
+            logger.warning(
+                'Cannot disconnect from %s: %s',
+                agent.host,
+                e
+            )
 
     def process_client_msg(self, msg):
         """
@@ -680,6 +1182,80 @@ class VPollerWorker(multiprocessing.Process):
         if not validate_message(msg=msg, required=task.required):
             return {'success': 1, 'msg': 'Invalid task request'}
 
+        if self.result_cache is None:
+            return self.run_task(task, agent, msg)
+
+        key = self.get_task_key(msg)
+        result = self.result_cache.get(key)
+        if result is not None:
+            logger.debug('Returning cached result for task %s', task.name)
+            return result
+
+        # The inventory changes rarely, so discovery results
+        # may be cached for longer than the other results
+        ttl = None
+        if task.name.endswith('.discover') and self.config.get('cache_discover_ttl') > 0:
+            ttl = self.config.get('cache_discover_ttl')
+
+        result = self.run_task(task, agent, msg)
+        if result.get('success') == 0:
+            self.result_cache.set(key, result, ttl=ttl)
+
+        return result
+
+    def run_task(self, task, agent, msg):
+        """
+        Runs a task using the given vSphere Agent
+
+        If throttling is enabled the requests to the vSphere host
+        are rate limited, so that we do not overload it. If a limit
+        of concurrent tasks per vSphere host is configured, the
+        task waits until a slot for the vSphere host is available.
+        A vSphere Agent without a session is connected first.
+
+        Args:
+            task       (Task): The task to run
+            agent (VConnector): The vSphere Agent used by the task
+            msg        (dict): The client message for the task
+
+        Returns:
+            The result of the task
+
+        """
+        # The vSphere Agent may have failed to connect on startup
+        if agent.si is None:
+            self.connect_agent(agent)
+
+        semaphore = self.semaphores.get(agent.host)
+        if semaphore is None:
+            return self.run_throttled_task(task, agent, msg)
+
+        with semaphore:
+            return self.run_throttled_task(task, agent, msg)
+
+    def run_throttled_task(self, task, agent, msg):
+        """
+        Runs a task, rate limiting the requests to the vSphere host
+
+        Args:
+            task       (Task): The task to run
+            agent (VConnector): The vSphere Agent used by the task
+            msg        (dict): The client message for the task
+
+        Returns:
+            The result of the task
+
+        """
+        throttle = self.throttles.get(agent.host)
+        if throttle is None:
+            return task.function(agent, msg)
+
+        throttle.wait()
+        start = time.time()
         result = task.function(agent, msg)
 
+        # Tasks do not raise, failures are reported in their result
+        failed = not isinstance(result, dict) or result.get('success') != 0
+        throttle.update(time.time() - start, failed=failed)
+
         return result
@@ -0,0 +1,80 @@
+# Copyright (c) 2013-2015 Marin Atanasov Nikolov <dnaeon@gmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer
+#    in this position and unchanged.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR(S) ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR(S) BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import time
+import unittest
+
+from vpoller.cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_get(self):
+        cache = TTLCache(ttl=60)
+        cache.set('a', 1)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+
+    def test_expired(self):
+        cache = TTLCache(ttl=60)
+        cache.set('a', 1, ttl=0.01)
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_set_removes_expired(self):
+        cache = TTLCache(ttl=60)
+        cache.set('a', 1, ttl=0.01)
+        time.sleep(0.02)
+        cache.set('b', 2)
+
+        self.assertEqual(len(cache), 1)
+
+    def test_evicts_closest_to_expiration(self):
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set('a', 1, ttl=30)
+        cache.set('b', 2, ttl=10)
+        cache.set('c', 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_replaced_entry(self):
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set('a', 1, ttl=10)
+        cache.set('a', 2, ttl=30)
+        cache.set('b', 3, ttl=20)
+        cache.set('c', 4)
+
+        self.assertEqual(cache.get('a'), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
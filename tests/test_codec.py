@@ -0,0 +1,92 @@
+# Copyright (c) 2013-2015 Marin Atanasov Nikolov <dnaeon@gmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer
+#    in this position and unchanged.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR(S) ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR(S) BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+
+from vpoller import codec
+
+try:
+    from pyVmomi.VmomiSupport import PropertyPath, byte, double, long, short
+except ImportError:
+    # Same definitions as in pyVmomi.VmomiSupport
+    class double(float):
+        pass
+
+    class long(int):
+        pass
+
+    class short(int):
+        pass
+
+    class byte(int):
+        pass
+
+    class PropertyPath(str):
+        pass
+
+
+class TestCodec(unittest.TestCase):
+    def setUp(self):
+        self.orjson = codec.orjson
+
+    def tearDown(self):
+        codec.orjson = self.orjson
+
+    def dumps_json(self, obj):
+        codec.orjson = None
+        try:
+            return codec.dumps(obj)
+        finally:
+            codec.orjson = self.orjson
+
+    def test_pyvmomi_scalars(self):
+        obj = {
+            'double': double(1.5),
+            'long': long(2 ** 40),
+            'short': short(3),
+            'byte': byte(4),
+            'path': PropertyPath('summary.name'),
+        }
+
+        expected = {
+            'double': 1.5,
+            'long': 2 ** 40,
+            'short': 3,
+            'byte': 4,
+            'path': 'summary.name',
+        }
+
+        self.assertEqual(codec.loads(self.dumps_json(obj)), expected)
+        self.assertEqual(codec.loads(codec.dumps(obj)), expected)
+
+    @unittest.skipIf(codec.orjson is None, 'orjson is not installed')
+    def test_orjson_matches_json(self):
+        obj = [double(0.25), long(7), PropertyPath('name'), {'a': double(1.5)}]
+
+        self.assertEqual(codec.dumps(obj), self.dumps_json(obj))
+
+
+if __name__ == '__main__':
+    unittest.main()
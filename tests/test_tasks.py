@@ -0,0 +1,159 @@
+# Copyright (c) 2013-2015 Marin Atanasov Nikolov <dnaeon@gmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer
+#    in this position and unchanged.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR(S) ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR(S) BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+
+try:
+    from vpoller.vsphere import tasks
+except ImportError:
+    tasks = None
+
+
+class Agent(object):
+    host = 'vc01.example.org'
+
+
+@unittest.skipIf(tasks is None, 'pyVmomi is not installed')
+class TestBatchGet(unittest.TestCase):
+    def setUp(self):
+        self.path_sets = []
+        self.get_container_view = tasks._get_container_view
+        self.iter_collect_properties = tasks._iter_collect_properties
+        tasks._get_container_view = self.fake_get_container_view
+        tasks._iter_collect_properties = self.fake_iter_collect_properties
+
+    def tearDown(self):
+        tasks._get_container_view = self.get_container_view
+        tasks._iter_collect_properties = self.iter_collect_properties
+
+    def fake_get_container_view(self, agent, obj_type, datacenter=None):
+        return None
+
+    def fake_iter_collect_properties(self, agent, view_ref, obj_type, path_set=None, **kwargs):
+        self.path_sets.append(path_set)
+        for name in ('vm01', 'vm02'):
+            yield {'name': name, 'info.url': 'ds:///' + name}
+
+    def test_vm_batch_get_without_properties(self):
+        msg = {
+            'method': 'vm.batch.get',
+            'hostname': 'vc01.example.org',
+            'name': ['vm01'],
+            'properties': None,
+        }
+
+        result = tasks.vm_batch_get(Agent(), msg)
+
+        self.assertEqual(result['success'], 0)
+        self.assertEqual(result['result'], [{'name': 'vm01', 'info.url': 'ds:///vm01'}])
+        self.assertEqual(self.path_sets, [['name']])
+
+    def test_host_batch_get_without_properties(self):
+        msg = {
+            'method': 'host.batch.get',
+            'hostname': 'vc01.example.org',
+            'name': 'vm01,vm02',
+            'properties': None,
+        }
+
+        result = tasks.host_batch_get(Agent(), msg)
+
+        self.assertEqual(result['success'], 0)
+        self.assertEqual(len(result['result']), 2)
+
+    def test_datastore_batch_get_without_properties(self):
+        msg = {
+            'method': 'datastore.batch.get',
+            'hostname': 'vc01.example.org',
+            'name': ['ds:///vm02'],
+            'properties': None,
+        }
+
+        result = tasks.datastore_batch_get(Agent(), msg)
+
+        self.assertEqual(result['success'], 0)
+        self.assertEqual(self.path_sets, [['info.url', 'name']])
+
+
+class Object(object):
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+@unittest.skipIf(tasks is None, 'pyVmomi is not installed')
+class TestAlarmGet(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.get_object_properties = tasks._get_object_properties
+        self.collect_object_properties = tasks._collect_object_properties
+        tasks._get_object_properties = self.fake_get_object_properties
+        tasks._collect_object_properties = self.fake_collect_object_properties
+
+        alarm = Object(name='Host connection state')
+        entities = [Object(name='esxi01'), Object(name='esxi02')]
+        self.alarms = [
+            Object(
+                key='alarm-1.host-{}'.format(i),
+                alarm=alarm,
+                time='2015-01-01 00:00:00',
+                entity=entity,
+                acknowledged=False,
+                overallStatus='red',
+                acknowledgedByUser=None
+            )
+            for i, entity in enumerate(entities)
+        ]
+
+    def tearDown(self):
+        tasks._get_object_properties = self.get_object_properties
+        tasks._collect_object_properties = self.collect_object_properties
+
+    def fake_get_object_properties(self, agent, properties, **kwargs):
+        return {'success': 0, 'result': [{'triggeredAlarmState': self.alarms}]}
+
+    def fake_collect_object_properties(self, agent, objects, obj_type, path_set=None, include_mors=False):
+        self.requests.append(path_set)
+        return [{'obj': obj, path_set[0]: obj.name} for obj in objects]
+
+    def test_host_alarm_get(self):
+        msg = {
+            'method': 'host.alarm.get',
+            'hostname': 'vc01.example.org',
+            'name': 'esxi01',
+        }
+
+        result = tasks.host_alarm_get(Agent(), msg)
+
+        self.assertEqual(result['success'], 0)
+        self.assertEqual(
+            [(a['info'], a['entity']) for a in result['result']],
+            [('Host connection state', 'esxi01'), ('Host connection state', 'esxi02')]
+        )
+        # A single request for the alarm names and one for the entity names
+        self.assertEqual(self.requests, [['info.name'], ['name']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+# Copyright (c) 2013-2015 Marin Atanasov Nikolov <dnaeon@gmail.com>
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer
+#    in this position and unchanged.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR(S) ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR(S) BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+import time
+import unittest
+
+from multiprocessing.pool import ThreadPool
+
+import zmq
+
+from vpoller import codec
+from vpoller.task.core import Task
+from vpoller.task.decorators import task
+from vpoller.task.registry import registry
+from vpoller.throttle import Throttle
+
+try:
+    from vpoller.worker import VPollerWorker
+except ImportError:
+    VPollerWorker = None
+
+
+class Agent(object):
+    def __init__(self, host):
+        self.host = host
+        self.si = object()
+
+
+@unittest.skipIf(VPollerWorker is None, 'pyVmomi or vConnector is not installed')
+class TestWorker(unittest.TestCase):
+    def setUp(self):
+        self.worker = VPollerWorker(
+            db=None,
+            proxy=None,
+            helpers=[],
+            tasks=[],
+            cache_enabled=False,
+            cache_maxsize=0,
+            cache_ttl=0,
+            cache_housekeeping=0,
+            max_rps=100,
+        )
+        self.agent = Agent('vc1')
+        self.throttle = Throttle(name='vc1', max_rps=100)
+        self.worker.throttles['vc1'] = self.throttle
+
+    def tearDown(self):
+        registry.unregister('test.throttle')
+
+    def test_failed_task_lowers_rate(self):
+        @task(name='test.throttle')
+        def fail(agent, msg):
+            raise Exception('vSphere fault')
+
+        result = self.worker.run_throttled_task(
+            Task(name='test.throttle', function=fail),
+            self.agent,
+            {'method': 'test.throttle'}
+        )
+
+        self.assertEqual(result['success'], 1)
+        self.assertLess(self.throttle.rate, self.throttle.max_rps)
+
+    def test_successful_task_keeps_rate(self):
+        @task(name='test.throttle')
+        def succeed(agent, msg):
+            return {'success': 0, 'msg': 'Successfully executed task'}
+
+        self.worker.run_throttled_task(
+            Task(name='test.throttle', function=succeed),
+            self.agent,
+            {'method': 'test.throttle'}
+        )
+
+        self.assertEqual(self.throttle.rate, self.throttle.max_rps)
+
+
+@unittest.skipIf(VPollerWorker is None, 'pyVmomi or vConnector is not installed')
+class TestSharedTasks(unittest.TestCase):
+    def setUp(self):
+        self.worker = VPollerWorker(
+            db=None,
+            proxy=None,
+            helpers=[],
+            tasks=[],
+            cache_enabled=False,
+            cache_maxsize=0,
+            cache_ttl=0,
+            cache_housekeeping=0,
+            threads=2,
+        )
+        self.worker.zcontext = zmq.Context()
+        self.worker.result_socket = self.worker.zcontext.socket(zmq.PULL)
+        self.worker.result_socket.bind(self.worker.result_endpoint)
+        self.worker.pool = ThreadPool(processes=2)
+        self.worker.process_client_msg = self.process_client_msg
+        self.calls = []
+
+    def tearDown(self):
+        self.worker.pool.close()
+        self.worker.pool.join()
+        for socket in self.worker.thread_sockets:
+            socket.close()
+        self.worker.result_socket.close()
+        self.worker.zcontext.term()
+
+    def process_client_msg(self, msg):
+        self.calls.append(msg['name'])
+        time.sleep(msg['delay'])
+        return {'success': 0, 'msg': 'Successfully executed task', 'result': msg['name']}
+
+    def receive(self):
+        self.assertTrue(self.worker.result_socket.poll(5000))
+        frames = self.worker.result_socket.recv_multipart()
+        return frames[0], codec.loads(frames[-1])['result'], time.time()
+
+    def test_identical_tasks_do_not_take_threads(self):
+        start = time.time()
+        self.worker.submit_task([b'1', b''], {'name': 'a', 'delay': 1})
+        self.worker.submit_task([b'2', b''], {'name': 'a', 'delay': 1})
+        self.worker.submit_task([b'3', b''], {'name': 'c', 'delay': 0})
+
+        results = [self.receive() for _ in range(3)]
+
+        self.assertEqual(self.calls.count('a'), 1)
+        self.assertEqual(
+            sorted((client, name) for client, name, _ in results),
+            [(b'1', 'a'), (b'2', 'a'), (b'3', 'c')]
+        )
+        # The identical task did not keep the other task waiting
+        received = dict((name, t) for _, name, t in results)
+        self.assertLess(received['c'] - start, 0.5)
+        self.assertEqual(self.worker.inflight, {})
+
+
+if __name__ == '__main__':
+    unittest.main()